@@ -0,0 +1,13 @@
+"""
+B2B AI 데이터 분석 에이전트 코어 패키지
+
+app.py (로컬/Render)와 api/index.py (Vercel) 가 함께 사용한다.
+pandas, google.generativeai 등 무거운 모듈은 각 서브모듈을 처음 사용할 때 import 된다.
+
+- config: 데이터 파일 경로 등 환경 변수 기반 설정
+- data_processor: 데이터 로드 및 분석
+- ai_agent: Gemini 기반 분석 에이전트
+- visualizer: 차트 데이터 생성
+- runtime: 프로세스 단위 DataProcessor/Agent 제공자와 워밍업
+- routes: /api 라우트 (Flask Blueprint)
+"""
@@ -0,0 +1,291 @@
+"""
+LLM 없이 분석 데이터로 만드는 템플릿 답변
+
+_analyze_query가 인식한 질문 유형(제품 판매, 주요 구매 고객, 구매 증가/감소/휴면 고객, 마케팅 대상, 고객 세분화, 특정 고객)은
+DataProcessor 결과만으로 답할 수 있으므로 시스템 프롬프트의 응답 형식(핵심 요약, 차트 안내, 표, 인사이트)에 맞춰
+Markdown으로 구성한다. 같은 데이터면 항상 같은 답변이며 LLM 장애 시 대체 답변에도 사용한다.
+"""
+from . import metrics
+
+# 답변 모드 (chat의 answer_mode)
+# - llm: 항상 Gemini로 답변
+# - auto: 인식한 질문 유형이면 템플릿, 아니면 Gemini
+# - template: 항상 템플릿 (인식하지 못한 질문은 전체 요약과 질문 안내)
+ANSWER_MODES = ('llm', 'auto', 'template')
+
+# 표에 보여줄 최대 행 수
+TABLE_ROWS = 10
+
+# 대체 답변 사유별 안내 문구
+FALLBACK_NOTICES = {
+    'circuit_open': 'AI 분석 서비스를 일시적으로 사용할 수 없어',
+    'timeout': 'AI 분석 응답이 지연되어',
+    'error': 'AI 분석 중 오류가 발생하여'
+}
+
+template_answers = metrics.REGISTRY.register(metrics.Counter(
+    'b2b_template_answers_total', 'LLM 없이 템플릿으로 만든 답변 수 (kind=template|fallback)', ('kind',)
+))
+
+
+def _won(value):
+    return f"{value:,.0f}원"
+
+
+def _cell(value):
+    return str(value).replace('|', '\\|').replace('\n', ' ')
+
+
+def _table(headers, rows):
+    """Markdown 표"""
+    lines = ['| ' + ' | '.join(headers) + ' |', '|' + '---|' * len(headers)]
+    lines.extend('| ' + ' | '.join(_cell(value) for value in row) + ' |' for row in rows)
+    return lines
+
+
+def _share(part, total):
+    return part / total * 100 if total else 0
+
+
+def _top_item(distribution):
+    """분포 딕셔너리에서 가장 많은 항목과 비율"""
+    if not distribution:
+        return None, 0
+    name, count = next(iter(distribution.items()))
+    return name, _share(count, sum(distribution.values()))
+
+
+def recognized(analysis_data):
+    """템플릿으로 답할 수 있는 분석 데이터인지 (제품, 트렌드, 마케팅, 고객 세분화, 특정 고객 중 하나라도 있으면)"""
+    return any(
+        data and (key.startswith('product_') or key in ('trend_analysis', 'marketing_recommendations', 'rfm_segments', 'specific_customers'))
+        for key, data in analysis_data.items()
+    )
+
+
+def _product_section(data, customers_info):
+    summary = (
+        f"**{data['product_code']}** 제품은 {data['customer_count']:,}개 기업에 {data['transaction_count']:,}건 판매되어 "
+        f"총 {data['total_quantity']:,}개, {_won(data['total_revenue'])}의 매출을 기록했습니다 (평균 마진율 {data['avg_margin']}%)."
+    )
+
+    table = [f"**{data['product_code']} 주요 구매 고객 TOP {min(TABLE_ROWS, len(data['customers']))}**", '']
+    table += _table(
+        ['순위', '거래처', '구매수량', '구매금액', '구매횟수', '매출 비중'],
+        [
+            (i, c['거래처'], f"{c['총구매수량']:,.0f}", _won(c['총구매금액']), f"{c['구매횟수']:,}",
+             f"{_share(c['총구매금액'], data['total_revenue']):.1f}%")
+            for i, c in enumerate(data['customers'][:TABLE_ROWS], 1)
+        ]
+    )
+
+    insights = []
+    top3 = sum(c['총구매금액'] for c in data['customers'][:3])
+    if data['customers']:
+        insights.append(
+            f"{data['product_code']} 상위 3개 고객이 매출의 {_share(top3, data['total_revenue']):.1f}%를 차지합니다"
+            + (" - 고객 집중도가 높아 주요 고객 관리가 중요합니다." if _share(top3, data['total_revenue']) >= 50 else ".")
+        )
+    if data['monthly_sales']:
+        peak = max(data['monthly_sales'], key=lambda m: m['합계'])
+        insights.append(f"월 매출이 가장 높았던 시기는 {peak['연도']}년 {peak['월']}월({_won(peak['합계'])})입니다.")
+    if customers_info:
+        industry, industry_share = _top_item(customers_info['industry_distribution'])
+        region, region_share = _top_item(customers_info['location_distribution'])
+        if industry:
+            insights.append(
+                f"주요 구매 고객은 {industry}({industry_share:.0f}%), {region}({region_share:.0f}%) 비중이 높아 "
+                f"유사 업종/지역 기업이 신규 영업 대상으로 적합합니다."
+            )
+    return summary, table, insights
+
+
+def _trend_section(data, user_message):
+    trend = data['summary']
+    summary = (
+        f"최근 6개월 기준 전체 {trend['total_customers']:,}개 고객 중 구매 증가 {trend['increasing_count']:,}곳, "
+        f"감소 {trend['decreasing_count']:,}곳, 휴면 {trend['inactive_count']:,}곳입니다."
+    )
+
+    tables = {
+        'increasing': _table(
+            ['거래처', '증감율', '총매출', '최근구매일'],
+            [(c['거래처'], f"{c['증감율']:+.1f}%", _won(c['총매출']), c['최근구매일'])
+             for c in data['increasing_customers'][:TABLE_ROWS]]
+        ),
+        'decreasing': _table(
+            ['거래처', '증감율', '총매출', '최근구매일'],
+            [(c['거래처'], f"{c['증감율']:+.1f}%", _won(c['총매출']), c['최근구매일'])
+             for c in data['decreasing_customers'][:TABLE_ROWS]]
+        ),
+        'inactive': _table(
+            ['거래처', '과거 총매출', '구매횟수', '최근구매일'],
+            [(c['거래처'], _won(c['총매출']), f"{c['구매횟수']:,}", c['최근구매일'])
+             for c in data['inactive_customers'][:TABLE_ROWS]]
+        )
+    }
+    titles = {
+        'increasing': '📈 구매량 증가 고객',
+        'decreasing': '📉 구매량 감소 고객',
+        'inactive': '💤 휴면 고객 (최근 6개월 구매 없음)'
+    }
+    lists = {
+        'increasing': data['increasing_customers'],
+        'decreasing': data['decreasing_customers'],
+        'inactive': data['inactive_customers']
+    }
+
+    # 질문에서 언급한 유형을 먼저 보여줌
+    order = ['increasing', 'decreasing', 'inactive']
+    mentioned = [kind for kind, words in (
+        ('inactive', ('휴면',)), ('decreasing', ('감소', '줄어', '하락')), ('increasing', ('증가', '늘어', '성장'))
+    ) if any(word in user_message for word in words)]
+    order = mentioned + [kind for kind in order if kind not in mentioned]
+
+    table = []
+    for kind in order:
+        if not lists[kind]:
+            continue
+        if table:
+            table.append('')
+        table += [f"**{titles[kind]} TOP {min(TABLE_ROWS, len(lists[kind]))}**", ''] + tables[kind]
+
+    insights = []
+    if 'inactive' in mentioned and not data['inactive_customers']:
+        insights.append("최근 6개월 동안 구매가 없는 휴면 고객은 없습니다.")
+    if trend['decreasing_count'] > trend['increasing_count']:
+        insights.append(
+            f"구매 감소 고객이 증가 고객보다 {trend['decreasing_count'] - trend['increasing_count']:,}곳 많습니다 "
+            f"- 감소 고객 대상 재활성화 활동이 우선입니다."
+        )
+    elif trend['increasing_count']:
+        insights.append("구매 증가 고객이 감소 고객 이상으로 많습니다 - 증가 고객 대상 교차 판매 기회를 살펴보세요.")
+    if data['inactive_customers']:
+        dormant_revenue = sum(c['총매출'] for c in data['inactive_customers'])
+        insights.append(
+            f"표시된 휴면 고객의 과거 매출 합계는 {_won(dormant_revenue)}로, 복귀 유도 프로모션 대상입니다."
+        )
+    return summary, table, insights
+
+
+def _marketing_section(data):
+    high = [rec for rec in data if rec['priority'] == 'High']
+    summary = f"마케팅 우선 대상은 {len(data):,}곳이며, 이 중 {len(high):,}곳은 우선순위가 높습니다."
+    table = ['**🎯 마케팅 대상 추천**', ''] + _table(
+        ['우선순위', '거래처', '사유', '지표', '권장 액션', '총매출'],
+        [(rec['priority'], rec['customer'], rec['reason'], rec['metric'], rec['action'], _won(rec['total_revenue']))
+         for rec in data[:TABLE_ROWS]]
+    )
+
+    insights = []
+    by_action = {}
+    for rec in data:
+        by_action.setdefault(rec['action'], []).append(rec['customer'])
+    for action, customers in by_action.items():
+        insights.append(f"{action}: {', '.join(customers[:5])}")
+    for rec in data:
+        if rec.get('products'):
+            insights.append(f"{rec['customer']} 교차 판매 추천 제품 (함께 구매되는 제품): {', '.join(rec['products'])}")
+    return summary, table, insights
+
+
+def _segments_section(data):
+    segments = data['summary']
+    total = sum(seg['count'] for seg in segments)
+    summary = f"RFM 기준({data['reference_date']}) 구매 고객 {total:,}곳을 {len(segments)}개 세그먼트로 나눴습니다."
+    table = ['**🧭 RFM 고객 세분화**', ''] + _table(
+        ['세그먼트', '고객 수', '매출 비중', '평균 경과일수', '평균 구매횟수', '권장 액션'],
+        [(seg['segment'], f"{seg['count']:,}", f"{seg['revenue_share']:.1f}%", f"{seg['avg_recency_days']:.0f}일",
+          f"{seg['avg_frequency']:,.0f}", seg['action']) for seg in segments]
+    )
+
+    insights = []
+    if segments:
+        top = max(segments, key=lambda seg: seg['revenue_share'])
+        insights.append(f"매출 비중이 가장 큰 세그먼트는 {top['segment']}({top['revenue_share']:.1f}%)입니다.")
+    at_risk = [seg for seg in segments if seg['segment'].startswith('이탈위험')]
+    if at_risk:
+        insights.append(
+            f"이탈위험 고객 {sum(seg['count'] for seg in at_risk):,}곳의 매출 비중이 "
+            f"{sum(seg['revenue_share'] for seg in at_risk):.1f}%로, 재구매 유도가 필요합니다."
+        )
+    return summary, table, insights
+
+
+def _customers_section(data):
+    industry, industry_share = _top_item(data['industry_distribution'])
+    summary = f"언급하신 고객 {data['total_customers']:,}곳의 정보입니다."
+    table = ['**🏢 고객 정보**', ''] + _table(
+        ['거래처', '업종', '세부 업종', '직원수', '고객등급', '시도'],
+        [(d['거래처'], d['업종'], d['세부 업종'], d['직원수'], d['고객등급'], d['시도']) for d in data['details'][:TABLE_ROWS]]
+    )
+    insights = [f"주요 업종은 {industry}({industry_share:.0f}%)입니다."] if industry else []
+    return summary, table, insights
+
+
+def _summary_lines(summary):
+    if not summary:
+        return []
+    return [
+        f"전체 매출 {_won(summary['total_revenue'])}, 거래 {summary['total_transactions']:,}건, "
+        f"고객 {summary['unique_customers']:,}곳 (최근 1년 매출 {_won(summary['recent_year_revenue'])}, "
+        f"최신 데이터 {summary['latest_date']})"
+    ]
+
+
+def _chart_lines(analysis_data):
+    charts = []
+    if any(key.startswith('product_') for key in analysis_data):
+        charts.append("월별 판매 추이와 주요 구매 고객 TOP 15 차트에서 제품별 판매 흐름과 핵심 고객을 확인하실 수 있습니다.")
+    if any(key.startswith('customers_of_') for key in analysis_data):
+        charts.append("업종/지역 분포 파이 차트에서 구매 고객 구성을 보실 수 있습니다.")
+    if 'trend_analysis' in analysis_data:
+        charts.append("구매량 증가/감소 고객 TOP 10 차트에서 변화가 큰 고객을 보실 수 있습니다.")
+    return charts
+
+
+def render_answer(user_message, analysis_data, summary):
+    """분석 데이터로 구성한 Markdown 답변 (인식한 질문 유형이 없으면 전체 요약과 질문 안내)"""
+    summaries, tables, insights = [], [], []
+
+    for key, data in analysis_data.items():
+        if not data:
+            continue
+        if key.startswith('product_'):
+            section = _product_section(data, analysis_data.get('customers_of_' + key[len('product_'):]))
+        elif key == 'trend_analysis':
+            section = _trend_section(data, user_message)
+        elif key == 'marketing_recommendations':
+            section = _marketing_section(data)
+        elif key == 'rfm_segments':
+            section = _segments_section(data)
+        elif key == 'specific_customers':
+            section = _customers_section(data)
+        else:
+            continue
+        summaries.append(section[0])
+        tables.extend(section[1] + [''])
+        insights.extend(section[2])
+
+    if not summaries:
+        summaries = _summary_lines(summary)
+        insights = ["제품 코드(예: 9322-14, GPL-110GF, 9448HK)나 '증가/감소/휴면 고객', '마케팅 대상'을 포함해 질문하시면 상세 분석을 제공해 드립니다."]
+
+    lines = ['**📊 핵심 요약**', ''] + [f"- {line}" for line in summaries] + ['']
+    charts = _chart_lines(analysis_data)
+    if charts:
+        lines += ['**📈 주요 데이터 및 시각화 안내**', ''] + [f"- {line}" for line in charts] + ['']
+    if tables:
+        lines += ['**📋 상세 분석**', ''] + tables
+    if insights:
+        lines += ['**💡 비즈니스 인사이트**', ''] + [f"- {line}" for line in insights]
+    return '\n'.join(lines).strip()
+
+
+def render_fallback(user_message, analysis_data, summary, reason):
+    """LLM 장애 시 대체 답변 (안내 문구 + 템플릿 답변)"""
+    notice = FALLBACK_NOTICES.get(reason, FALLBACK_NOTICES['error'])
+    return (
+        f"⚠️ {notice} 데이터 기반 요약으로 답변드립니다. 잠시 후 다시 질문해 주시면 상세 분석을 제공해 드리겠습니다.\n\n"
+        + render_answer(user_message, analysis_data, summary)
+    )
@@ -0,0 +1,93 @@
+"""환경 변수 기반 설정"""
+import os
+import tempfile
+
+# 패키지 상위 디렉토리 (저장소 루트)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 데이터 파일 위치 - 실행 디렉토리(CWD)와 무관하게 저장소 루트 기준
+DATA_DIR = os.environ.get('B2B_DATA_DIR', PROJECT_ROOT)
+SALES_DATA_PATH = os.environ.get('B2B_SALES_DATA', os.path.join(DATA_DIR, 'SALES DATA.csv'))
+COMPANY_DATA_PATH = os.environ.get('B2B_COMPANY_DATA', os.path.join(DATA_DIR, 'Details of the company.xlsx'))
+
+# 데이터 형식 (csv, xlsx, parquet, sqlite) - 비워두면 파일 확장자로 판단
+SALES_DATA_FORMAT = os.environ.get('B2B_SALES_FORMAT') or None
+COMPANY_DATA_FORMAT = os.environ.get('B2B_COMPANY_FORMAT') or None
+
+# 판매 데이터를 청크 단위로 읽을 행 수 (0이면 한 번에 읽음)
+# 메모리 제한 효과는 sqlite 백엔드에만 있다 (청크가 바로 저장소에 추가되어 로드 시 메모리가 청크 크기로 제한됨)
+# pandas 백엔드는 정리한 청크를 모두 모아 합치므로 합치는 동안 청크들과 합친 결과가 함께 메모리에 있다
+CSV_CHUNKSIZE = int(os.environ.get('B2B_CSV_CHUNKSIZE') or 0)
+
+# SQLite 소스의 테이블 이름
+SALES_DATA_TABLE = os.environ.get('B2B_SALES_TABLE', 'sales')
+COMPANY_DATA_TABLE = os.environ.get('B2B_COMPANY_TABLE', 'companies')
+
+# Gemini API Key
+GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
+
+# 워밍업 모드 (B2B_WARMUP)
+# - 미설정: 첫 요청 시 로드
+# - sync (또는 1/true): gunicorn post_worker_init 훅 또는 서버 시작 전에 동기 로드
+# - background: 백그라운드 스레드로 로드
+WARMUP_MODE = os.environ.get('B2B_WARMUP', '').strip().lower()
+if WARMUP_MODE in ('1', 'true', 'yes'):
+    WARMUP_MODE = 'sync'
+elif WARMUP_MODE in ('0', 'false', 'no'):
+    WARMUP_MODE = ''
+
+# DataProcessor 백엔드
+# - pandas: 전체 데이터를 워커 메모리에 DataFrame으로 유지 (기본)
+# - sqlite: 전처리된 데이터를 로컬 SQLite 파일에 저장하고 인덱스 기반 SQL로 조회
+BACKEND = os.environ.get('B2B_BACKEND', 'pandas').strip().lower()
+SQLITE_STORE_PATH = os.environ.get('B2B_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'b2b_store.sqlite'))
+# 이전 버전 저장소 파일 보존 시간 (초) - 새 버전이 만들어진 뒤 이 시간이 지나야 삭제 (다른 워커가 아직 읽을 수 있음)
+SQLITE_STORE_GRACE = float(os.environ.get('B2B_SQLITE_STORE_GRACE') or 3600)
+
+# 로그 레벨 (채팅 요청 단계별 소요 시간은 INFO로 기록됨)
+LOG_LEVEL = os.environ.get('B2B_LOG_LEVEL', 'INFO').strip().upper()
+
+# 대화 세션 유지 시간 (초) - 마지막 요청 후 이 시간이 지나면 세션의 대화 히스토리를 정리
+SESSION_TTL = int(os.environ.get('B2B_SESSION_TTL') or 1800)
+
+# 요청 프로파일링 (기본: 꺼짐)
+# - B2B_PROFILE_THRESHOLD_MS: 0보다 크면 모든 요청을 샘플링하고, 이 시간보다 오래 걸린 요청의 프로파일을 저장
+# - B2B_PROFILE_HEADER: 1이면 X-B2B-Profile: 1 헤더가 있는 요청을 cProfile로 프로파일링
+PROFILE_THRESHOLD_MS = float(os.environ.get('B2B_PROFILE_THRESHOLD_MS') or 0)
+PROFILE_HEADER = os.environ.get('B2B_PROFILE_HEADER', '').strip().lower() in ('1', 'true', 'yes')
+PROFILE_DIR = os.environ.get('B2B_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'b2b_profiles'))
+# 보관할 프로파일 수 (초과하면 오래된 것부터 삭제)
+PROFILE_KEEP = int(os.environ.get('B2B_PROFILE_KEEP') or 50)
+# 샘플링 간격 (ms)
+PROFILE_INTERVAL_MS = float(os.environ.get('B2B_PROFILE_INTERVAL_MS') or 10)
+
+# 데이터 핫 리로드
+# - B2B_RELOAD_INTERVAL: 0보다 크면 이 간격(초)으로 데이터 파일 변경을 확인해 새 데이터셋으로 교체
+# - B2B_RELOAD_TOKEN: POST /api/reload 요청에 X-B2B-Reload-Token 헤더로 같은 값이 필요 (설정하지 않으면 리로드 API 비활성화)
+# - B2B_RELOAD_SIGNAL: 리로드 신호 파일 - POST /api/reload가 수정 시각을 갱신하면 같은 서버의 모든 워커가 리로드
+RELOAD_INTERVAL = float(os.environ.get('B2B_RELOAD_INTERVAL') or 0)
+RELOAD_TOKEN = os.environ.get('B2B_RELOAD_TOKEN') or None
+RELOAD_SIGNAL_PATH = os.environ.get('B2B_RELOAD_SIGNAL', os.path.join(tempfile.gettempdir(), 'b2b_reload.signal'))
+
+# Gemini 호출 제한 (LLM 장애 시 워커가 묶이지 않도록)
+# - B2B_LLM_TIMEOUT: 호출 1회의 제한 시간 (초)
+# - B2B_LLM_DEADLINE: 재시도를 포함한 전체 제한 시간 (초)
+# - B2B_LLM_RETRIES: 일시적 오류(타임아웃, 429, 5xx) 재시도 횟수 - 지수 백오프(B2B_LLM_BACKOFF초부터)에 지터 적용
+# - B2B_LLM_BREAKER_THRESHOLD: 연속 실패가 이 횟수에 이르면 B2B_LLM_BREAKER_COOLDOWN초 동안 호출하지 않고 바로 대체 답변
+LLM_TIMEOUT = float(os.environ.get('B2B_LLM_TIMEOUT') or 30)
+LLM_DEADLINE = float(os.environ.get('B2B_LLM_DEADLINE') or 60)
+LLM_RETRIES = int(os.environ.get('B2B_LLM_RETRIES') or 2)
+LLM_BACKOFF = float(os.environ.get('B2B_LLM_BACKOFF') or 0.5)
+LLM_BREAKER_THRESHOLD = int(os.environ.get('B2B_LLM_BREAKER_THRESHOLD') or 5)
+LLM_BREAKER_COOLDOWN = float(os.environ.get('B2B_LLM_BREAKER_COOLDOWN') or 30)
+# 동시에 진행할 수 있는 Gemini 호출 수 (제한 시간이 지나 응답을 포기한 호출도 끝날 때까지 자리를 차지함)
+LLM_MAX_CONCURRENCY = int(os.environ.get('B2B_LLM_MAX_CONCURRENCY') or 16)
+
+# 채팅 답변 모드 기본값 (요청별 answer_mode로 변경 가능)
+# - llm: 항상 Gemini로 답변
+# - auto: 제품 판매, 주요/휴면 고객, 마케팅 대상 등 인식한 질문은 Gemini 없이 템플릿으로 답변
+# - template: 항상 템플릿으로 답변
+ANSWER_MODE = os.environ.get('B2B_ANSWER_MODE', 'llm').strip().lower()
+
+# 프롬프트에 원문으로 넣을 대화 히스토리 토큰 예산 (넘는 오래된 대화는 요약으로 접음)
+HISTORY_TOKENS = int(os.environ.get('B2B_HISTORY_TOKENS') or 4000)
@@ -0,0 +1,77 @@
+"""
+대화 히스토리 관리 (토큰 예산 + 이전 대화 요약)
+
+최근 대화는 토큰 예산(B2B_HISTORY_TOKENS) 안에서 원문 그대로 프롬프트에 넣고,
+예산을 넘는 오래된 대화는 질문과 답변의 첫 내용 줄만 뽑은 한 줄 요약으로 접어 세션에 저장한다.
+요약은 세션에 누적되므로 다음 요청부터는 새로 접힌 대화만 요약하면 된다.
+"""
+from . import config
+from .timing import estimate_tokens
+
+# 요약 한 줄에 남길 질문/답변 최대 글자 수
+QUESTION_CHARS = 80
+ANSWER_CHARS = 160
+
+
+def message(role, content):
+    """히스토리 메시지 (토큰 수를 저장해 두어 매 요청 다시 세지 않음)"""
+    return {'role': role, 'content': content, 'tokens': estimate_tokens(content)}
+
+
+def _clip(text, limit):
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+
+def _is_heading(line):
+    """제목 줄 (# 제목, **굵은 제목** 한 줄)"""
+    return line.startswith('#') or (line.startswith('**') and line.endswith('**'))
+
+
+def _digest(text, limit):
+    """답변에서 표, 제목, 빈 줄을 뺀 첫 내용 줄들"""
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('|') or _is_heading(line) or not line.strip('-*_= '):
+            continue
+        lines.append(line.lstrip('-*• ').replace('**', ''))
+        if sum(len(item) for item in lines) >= limit:
+            break
+    return _clip(' '.join(lines), limit)
+
+
+def summarize_turn(question, answer):
+    """질문/답변 한 쌍의 한 줄 요약"""
+    return f"- 질문: {_clip(' '.join(question.split()), QUESTION_CHARS)} → 답변: {_digest(answer, ANSWER_CHARS)}"
+
+
+def fold(session, budget=None):
+    """예산을 넘는 오래된 대화를 세션 요약으로 옮기고 (프롬프트에 넣을 최근 메시지 목록, 요약 텍스트) 반환
+
+    히스토리는 (질문, 답변) 쌍 단위로 최신 대화부터 예산에 들어가는 만큼 남긴다.
+    요약도 예산의 1/4을 넘으면 오래된 줄부터 버린다.
+    """
+    budget = config.HISTORY_TOKENS if budget is None else budget
+    history = session['history']
+
+    kept = 0
+    used = 0
+    for start in range(len(history) - 2, -1, -2):
+        tokens = sum(msg['tokens'] for msg in history[start:start + 2])
+        if used + tokens > budget:
+            break
+        used += tokens
+        kept = len(history) - start
+
+    folded = len(history) - kept
+    summary = session.setdefault('summary', [])
+    if folded:
+        for i in range(0, folded - 1, 2):
+            summary.append(summarize_turn(history[i]['content'], history[i + 1]['content']))
+        del history[:folded]
+        session['summarized_turns'] = session.get('summarized_turns', 0) + folded // 2
+
+        while len(summary) > 1 and estimate_tokens('\n'.join(summary)) > budget // 4:
+            summary.pop(0)
+
+    return list(history), '\n'.join(summary)
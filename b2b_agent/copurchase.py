@@ -0,0 +1,129 @@
+"""
+제품 동시 구매(co-purchase) 추천
+
+거래처×제품 구매 여부로 두 제품을 함께 구매한 거래처 수를 세고, 제품 간 코사인 유사도
+(함께 구매한 거래처 수 / √(각 제품 구매 거래처 수의 곱))를 계산한다. 구매 여부 행렬은 거래처 블록 단위로만
+만들어 메모리를 제한하고(numpy만 사용), 동시 구매 수 행렬은 제품 수²(float32) 크기다.
+로드 시 제품별 함께 구매된 제품과 거래처별 추천 제품을 TOP_K개씩 (행 수, TOP_K) 배열로 미리 구해 두므로
+조회는 행 하나를 읽는 것뿐이다.
+"""
+import numpy as np
+import pandas as pd
+
+# 미리 계산해 둘 제품별 함께 구매된 제품 / 거래처별 추천 제품 수 (조회 limit 상한)
+TOP_K = 20
+
+# 유사도를 계산할 최소 동시 구매 거래처 수 (한 곳만 함께 산 제품은 우연으로 봄)
+MIN_SHARED_CUSTOMERS = 2
+
+# 거래처 블록 하나의 거래처×제품 행렬 최대 칸 수 (블록 크기 = BLOCK_CELLS // 제품 수)
+BLOCK_CELLS = 1 << 22
+
+
+def _top_k(scores, k):
+    """행마다 값이 큰 k개의 (열, 값) 배열 - 값 내림차순, 같으면 앞 열 우선, 0 이하는 열 -1로 비움"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((len(scores), 0), dtype=np.int32), np.empty((len(scores), 0), dtype=np.float32)
+    cols = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    values = np.take_along_axis(scores, cols, axis=1)
+    order = np.lexsort((cols, -values), axis=1)
+    cols = np.take_along_axis(cols, order, axis=1).astype(np.int32)
+    values = np.take_along_axis(values, order, axis=1).astype(np.float32)
+    cols[values <= 0] = -1
+    values[values <= 0] = 0
+    return cols, values
+
+
+class CoPurchaseIndex:
+    """거래처/제품별 구매 집계(거래처, 제품명 컬럼)로 만드는 동시 구매 인덱스"""
+
+    def __init__(self, customer_products, top_k=TOP_K, min_shared=MIN_SHARED_CUSTOMERS):
+        pairs = customer_products[['거래처', '제품명']].dropna().drop_duplicates()
+        customer_codes, customers = pd.factorize(pairs['거래처'])
+        product_codes, products = pd.factorize(pairs['제품명'])
+        self.customers = np.asarray(customers, dtype=object)
+        self.products = np.asarray(products, dtype=object)
+        self._customer_index = {name: i for i, name in enumerate(self.customers)}
+        self._product_index = {name: i for i, name in enumerate(self.products)}
+
+        n_customers, n_products = len(self.customers), len(self.products)
+        self.product_customers = np.bincount(product_codes, minlength=n_products)
+        self._norms = np.sqrt(self.product_customers)
+
+        # 거래처 순으로 정렬한 (거래처, 제품) 구매 쌍과 거래처 블록 경계
+        order = np.argsort(customer_codes, kind='stable')
+        customer_codes, product_codes = customer_codes[order], product_codes[order]
+        block = max(1, BLOCK_CELLS // max(n_products, 1))
+        starts = range(0, n_customers, block)
+        bounds = np.searchsorted(customer_codes, [(start, start + block) for start in starts])
+
+        # 제품×제품 동시 구매 거래처 수 (블록별 구매 여부 행렬의 곱을 누적) → 코사인 유사도
+        shared = np.zeros((n_products, n_products), dtype=np.float32)
+        for start, (lo, hi) in zip(starts, bounds):
+            bought = np.zeros((min(block, n_customers - start), n_products), dtype=np.float32)
+            bought[customer_codes[lo:hi] - start, product_codes[lo:hi]] = 1
+            shared += bought.T @ bought
+        np.fill_diagonal(shared, 0)
+        shared[shared < min_shared] = 0
+        shared /= self._norms[:, None]
+        shared /= self._norms[None, :]
+        self.similar_products, self.similar_scores = _top_k(shared, top_k)
+        del shared
+
+        # 거래처별 추천 점수: 구매한 제품들의 유사 제품 점수 합 (이미 구매한 제품 제외)
+        k = self.similar_products.shape[1]
+        self.suggested_products = np.full((n_customers, k), -1, dtype=np.int32)
+        self.suggested_scores = np.zeros((n_customers, k), dtype=np.float32)
+        for start, (lo, hi) in zip(starts, bounds):
+            size = min(block, n_customers - start)
+            rows, bought = customer_codes[lo:hi] - start, product_codes[lo:hi]
+            neighbors = self.similar_products[bought]
+            valid = neighbors >= 0
+            scores = np.bincount(
+                (np.repeat(rows, k).reshape(-1, k) * n_products + neighbors)[valid],
+                weights=self.similar_scores[bought][valid],
+                minlength=size * n_products
+            ).reshape(size, n_products)
+            scores[rows, bought] = 0
+            cols, values = _top_k(scores, k)
+            self.suggested_products[start:start + size] = cols
+            self.suggested_scores[start:start + size] = values
+
+    @staticmethod
+    def _row(products, scores, i, limit):
+        """i행의 (제품 번호, 값) - 값 내림차순, 빈 칸 제외"""
+        cols, values = products[i, :limit], scores[i, :limit]
+        filled = cols >= 0
+        return cols[filled], values[filled]
+
+    def has_product(self, product_name):
+        return product_name in self._product_index
+
+    def customer_count(self, product_name):
+        """제품을 구매한 거래처 수 (판매 기록이 없으면 0)"""
+        i = self._product_index.get(product_name)
+        return 0 if i is None else int(self.product_customers[i])
+
+    def related_products(self, product_name, limit=10):
+        """함께 구매된 제품 (유사도 순, 판매 기록이 없는 제품이면 None)"""
+        i = self._product_index.get(product_name)
+        if i is None:
+            return None
+        cols, values = self._row(self.similar_products, self.similar_scores, i, limit)
+        return [
+            {
+                '제품명': self.products[j],
+                'similarity': round(float(value), 4),
+                'shared_customers': int(round(float(value) * self._norms[i] * self._norms[j]))
+            }
+            for j, value in zip(cols, values)
+        ]
+
+    def suggestions_for(self, customer_name, limit=10):
+        """거래처가 아직 구매하지 않은 추천 제품 (점수 순, 판매 기록이 없는 거래처면 None)"""
+        i = self._customer_index.get(customer_name)
+        if i is None:
+            return None
+        cols, values = self._row(self.suggested_products, self.suggested_scores, i, limit)
+        return [{'제품명': self.products[j], 'score': round(float(value), 4)} for j, value in zip(cols, values)]
@@ -0,0 +1,744 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+import functools
+import hashlib
+import re
+import time
+from . import config, metrics, rfm
+from .copurchase import CoPurchaseIndex
+from .loaders import get_loader
+from .singleflight import SingleFlight
+
+_method_flight = SingleFlight('data_processor')
+
+
+def _freeze(value):
+    """인자를 single-flight key로 쓸 수 있게 변환 (리스트/딕셔너리는 튜플로)"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_freeze(v) for v in value]
+        return tuple(sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items)
+    return value
+
+
+def coalesced(method):
+    """같은 데이터셋 버전에서 같은 인자로 동시에 들어온 호출은 한 번만 계산하고 결과를 함께 사용
+
+    결과는 여러 요청이 공유하므로 호출한 쪽에서 수정하면 안 된다.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (type(self).__name__, method.__name__, self.version, _freeze(args), _freeze(kwargs))
+        return _method_flight.do(key, method, self, *args, **kwargs)
+    return wrapper
+
+
+class DataProcessor:
+    # 고객 프로필에 남길 주요 제품 수 (매출 순)
+    TOP_PRODUCTS = 5
+    # 교차 판매 추천에 붙일 제품 수
+    CROSS_SELL_PRODUCTS = 3
+
+    def __init__(self, sales_source=None, company_source=None, chunksize=None):
+        """데이터 소스 지정 (파일 경로, DataLoader 또는 DataFrame)
+
+        지정하지 않으면 config(B2B_SALES_DATA, B2B_SALES_FORMAT 등)의 소스를 사용한다.
+        chunksize(행 수)를 주면 판매 데이터를 청크 단위로 읽어 정리한다 (기본: B2B_CSV_CHUNKSIZE).
+        pandas 백엔드는 정리한 청크를 모두 합쳐 메모리에 두므로 로드 시 최대 메모리는 제한되지 않는다 (sqlite 백엔드만 해당).
+        """
+        if sales_source is None:
+            sales_source = get_loader(config.SALES_DATA_PATH, config.SALES_DATA_FORMAT, config.SALES_DATA_TABLE)
+        if company_source is None:
+            company_source = get_loader(config.COMPANY_DATA_PATH, config.COMPANY_DATA_FORMAT, config.COMPANY_DATA_TABLE)
+
+        self.sales_loader = get_loader(sales_source, table='sales')
+        self.company_loader = get_loader(company_source, table='companies')
+        self.chunksize = config.CSV_CHUNKSIZE if chunksize is None else chunksize
+        self.sales_data = None
+        self.company_data = None
+        self.load_data()
+
+    def _reset_caches(self):
+        """데이터셋에서 파생된 캐시 초기화와 데이터셋 버전 갱신 (load_data 시작 시)"""
+        self._summary_cache = None
+        self._dataset_stats = None
+        self._rfm_cache = None
+        self.loaded_at = time.time()
+        self.version = self._dataset_version()
+
+    def _dataset_version(self):
+        """데이터셋 버전 - 원본 파일 fingerprint의 해시 (같은 파일이면 워커가 달라도 같음)
+
+        fingerprint를 알 수 없는 소스(메모리 DataFrame 등)는 로드 시각으로 구분한다.
+        """
+        return self.source_version() or f"mem-{time.time_ns():x}"
+
+    def source_version(self):
+        """현재 원본 파일 기준의 데이터셋 버전 (version과 다르면 파일이 바뀐 것, 알 수 없으면 None)"""
+        fingerprints = [self.sales_loader.fingerprint(), self.company_loader.fingerprint()]
+        if None in fingerprints:
+            return None
+        return hashlib.sha1('|'.join(fingerprints).encode('utf-8')).hexdigest()[:12]
+
+    def load_data(self):
+        """데이터 로드 및 전처리"""
+        self._reset_caches()
+
+        # 판매 데이터 로드 (기본: CSV) - 청크별로 정리한 뒤 한 번에 합침 (합치는 동안 청크와 결과가 함께 메모리에 있음)
+        chunks = list(self._iter_sales_chunks())
+        self.sales_data = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+        self._build_date_index()
+        self._build_name_index()
+
+        # 기업 데이터 로드 (기본: Excel)
+        self.company_data = self.company_loader.load()
+        self._preprocess_company_data()
+
+        self._build_customer_tables()
+
+    def _iter_sales_chunks(self):
+        """판매 데이터를 읽어 전처리된 DataFrame을 순서대로 반환 (chunksize가 없으면 전체를 한 번에)"""
+        if self.chunksize:
+            raw_chunks = self.sales_loader.iter_chunks(self.chunksize)
+        else:
+            raw_chunks = [self.sales_loader.load()]
+
+        for chunk in raw_chunks:
+            yield self._preprocess_sales_chunk(chunk)
+
+    @staticmethod
+    def _clean_numeric(series, symbol):
+        """숫자 형식 정리 (쉼표/퍼센트 기호와 공백 제거, 변환할 수 없는 값은 0)
+
+        parquet/sqlite 등 이미 숫자로 저장된 데이터는 문자열 정리를 건너뛴다.
+        """
+        if pd.api.types.is_numeric_dtype(series):
+            return series.fillna(0).astype(float)
+
+        cleaned = series.astype(str).str.replace(symbol, '', regex=False).str.strip()
+        return pd.to_numeric(cleaned, errors='coerce').fillna(0).astype(float)
+
+    def _preprocess_sales_chunk(self, sales_data):
+        """판매 데이터 전처리"""
+        # 컬럼명 정리
+        sales_data.columns = sales_data.columns.str.strip()
+
+        # 날짜 형식 변환
+        sales_data['매출일'] = pd.to_datetime(sales_data['매출일'])
+
+        # 숫자 컬럼 정리
+        numeric_columns = ['수량', '매입단가(3%)', '판매단가', '공급가액', '부가세', '합계']
+        for col in numeric_columns:
+            sales_data[col] = self._clean_numeric(sales_data[col], ',')
+
+        # 마진율 정리
+        sales_data['마진율'] = self._clean_numeric(sales_data['마진율'], '%')
+
+        # 연도, 월, 분기 추가
+        sales_data['연도'] = sales_data['매출일'].dt.year
+        sales_data['월'] = sales_data['매출일'].dt.month
+        sales_data['분기'] = sales_data['매출일'].dt.quarter
+
+        # 거래처명 정리
+        sales_data['거래처'] = sales_data['거래처'].str.strip()
+
+        return sales_data
+
+    def _build_date_index(self):
+        """매출일 기준으로 정렬하고 이진 탐색용 날짜 배열을 캐시 (기간 조회를 O(log n)으로)"""
+        self.sales_data = self.sales_data.sort_values('매출일', kind='stable', ignore_index=True)
+        # 정렬 시 NaT는 끝으로 가므로 앞쪽 _dated_rows 개 행만 날짜가 있음
+        self._sale_dates = self.sales_data['매출일'].to_numpy()
+        self._dated_rows = int(self.sales_data['매출일'].notna().sum())
+
+    def _build_name_index(self):
+        """제품명별 행 위치 인덱스와 검색용 제품명/거래처 목록 (최초 등장 순서)
+
+        제품 코드/키워드 검색은 전체 행이 아닌 고유 이름 목록에서만 수행한다.
+        """
+        self._product_rows = self.sales_data.groupby('제품명', sort=False).indices
+        self._product_names = list(self._product_rows)
+        self._customer_names = self.sales_data['거래처'].dropna().unique().tolist()
+
+    @staticmethod
+    def _match(names, keyword):
+        """pandas str.contains(keyword, case=False)와 같은 규칙으로 이름 목록 필터링"""
+        pattern = re.compile(keyword, re.IGNORECASE)
+        return [name for name in names if isinstance(name, str) and pattern.search(name)]
+
+    @staticmethod
+    def _match_many(names, keywords):
+        """여러 키워드를 이름 목록 한 번 순회로 매칭 ({키워드: 일치하는 이름 목록}, _match와 같은 규칙)"""
+        patterns = [(keyword, re.compile(keyword, re.IGNORECASE)) for keyword in keywords]
+        matches = {keyword: [] for keyword in keywords}
+        for name in names:
+            if not isinstance(name, str):
+                continue
+            for keyword, pattern in patterns:
+                if pattern.search(name):
+                    matches[keyword].append(name)
+        return matches
+
+    def _customers_with(self, region=None, industry=None):
+        """지역(시도)/업종 조건에 맞는 거래처 목록 (조건이 없으면 None)"""
+        if not region and not industry:
+            return None
+
+        companies = self.company_data
+        if region:
+            companies = companies[companies['시도'].isin([region] if isinstance(region, str) else region)]
+        if industry:
+            companies = companies[companies['업종'].isin([industry] if isinstance(industry, str) else industry)]
+        return companies['거래처'].tolist()
+
+    @staticmethod
+    def _parse_date_range(start=None, end=None):
+        """기간 파라미터를 [start, end) 구간으로 변환 (end는 해당 날짜까지 포함)"""
+        start = pd.Timestamp(start) if start else None
+        end = pd.Timestamp(end).normalize() + pd.Timedelta(days=1) if end else None
+        return start, end
+
+    def _date_window(self, start=None, end=None):
+        """[start, end) 구간의 판매 데이터 (정렬된 날짜 배열에서 searchsorted로 위치를 찾아 슬라이스)"""
+        if start is None and end is None:
+            return self.sales_data
+
+        dates = self._sale_dates[:self._dated_rows]
+        i = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start), 'left'))
+        j = self._dated_rows if end is None else int(np.searchsorted(dates, np.datetime64(end), 'left'))
+        return self.sales_data.iloc[i:max(i, j)]
+
+    @staticmethod
+    def _last_sale_date(sales_data):
+        """정렬된 판매 데이터의 가장 최근 매출일 (마지막 행, 날짜 없는 행이 끝에 있으면 max)"""
+        latest_date = sales_data['매출일'].iloc[-1]
+        if pd.isna(latest_date):
+            latest_date = sales_data['매출일'].max()
+        return latest_date
+
+    def _preprocess_company_data(self):
+        """기업 데이터 전처리"""
+        # 컬럼명 정리
+        self.company_data.columns = self.company_data.columns.str.strip()
+
+        # 거래처명 정리
+        self.company_data['거래처'] = self.company_data['거래처'].str.strip()
+
+    def _build_customer_tables(self):
+        """거래처/제품별 구매 집계 한 번으로 고객 프로필과 동시 구매 인덱스 생성 (로드 시)"""
+        customer_products = self._customer_product_totals()
+        self._build_customer_profiles(customer_products)
+        self.copurchase = CoPurchaseIndex(customer_products)
+
+    def _build_customer_profiles(self, customer_products):
+        """거래처별 기업 정보 + 누적매출, 첫/최근 구매일, 구매횟수, 주요 제품 테이블 (로드 시 한 번 생성, 거래처 인덱스)
+
+        기업 정보에 같은 거래처가 여러 행이면 행마다 같은 판매 집계가 붙고,
+        판매 기록만 있는 거래처는 기업 정보 없이(기업정보=False) 뒤에 추가된다.
+        """
+        totals = self._customer_sales_totals().set_index('거래처')
+
+        # 거래처별 매출 상위 TOP_PRODUCTS개 제품
+        products = customer_products.sort_values(
+            ['거래처', '합계'], ascending=[True, False], kind='stable'
+        )
+        top = products.groupby('거래처', sort=False).head(self.TOP_PRODUCTS)
+        top_products = {}
+        for name, product, quantity, revenue in zip(top['거래처'], top['제품명'], top['수량'], top['합계']):
+            top_products.setdefault(name, []).append({'제품명': product, '수량': float(quantity), '합계': float(revenue)})
+
+        profiles = self.company_data.assign(기업정보=True)
+        known = set(profiles['거래처'])
+        sales_only = [name for name in totals.index if name not in known]
+        if sales_only:
+            # 기업 정보가 없는 행 때문에 정수 컬럼이 실수로 바뀌지 않도록 nullable 정수로 유지
+            int_columns = [col for col in profiles.columns if pd.api.types.is_integer_dtype(profiles[col])]
+            profiles = pd.concat([profiles, pd.DataFrame({'거래처': sales_only, '기업정보': False})], ignore_index=True)
+            profiles[int_columns] = profiles[int_columns].astype('Int64')
+
+        profiles = profiles.join(totals, on='거래처')
+        profiles['누적매출'] = profiles['누적매출'].fillna(0)
+        profiles['구매횟수'] = profiles['구매횟수'].fillna(0).astype(int)
+        profiles['주요제품'] = [top_products.get(name, []) for name in profiles['거래처']]
+
+        # 거래처별 행 위치 (기업 정보 순서 유지)
+        self._profile_rows = profiles.groupby('거래처', sort=False).indices
+        self.customer_profiles = profiles.set_index('거래처', drop=False).rename_axis(None)
+
+    def _customer_sales_totals(self):
+        """거래처별 누적매출, 첫/최근 구매일(문자열), 구매횟수"""
+        totals = self.sales_data.groupby('거래처').agg(
+            누적매출=('합계', 'sum'), 첫구매일=('매출일', 'min'), 최근구매일=('매출일', 'max'), 구매횟수=('매출일', 'count')
+        ).reset_index()
+        for col in ['첫구매일', '최근구매일']:
+            totals[col] = totals[col].dt.strftime('%Y-%m-%d')
+        return totals
+
+    def _customer_product_totals(self):
+        """거래처/제품별 수량, 매출 합계"""
+        return self.sales_data.groupby(['거래처', '제품명'])[['수량', '합계']].sum().reset_index()
+
+    @coalesced
+    def get_product_sales_analysis(self, product_code, start=None, end=None, region=None, industry=None,
+                                   limit=None, offset=0):
+        """특정 제품의 판매 분석
+
+        start/end(기간), region(시도), industry(업종) 조건은 집계 전에 적용되고,
+        구매 기업 목록은 총구매금액 순으로 offset부터 limit개를 반환한다. 조건에 맞는 거래가 없으면 None.
+        """
+        product_sales = self._product_sales(product_code, *self._parse_date_range(start, end))
+        if product_sales is None:
+            return None
+
+        customers = self._customers_with(region, industry)
+        if customers is not None:
+            product_sales = product_sales[product_sales['거래처'].isin(customers)]
+
+        if len(product_sales) == 0:
+            return None
+
+        # 판매량 분석
+        total_quantity = product_sales['수량'].sum()
+        total_revenue = product_sales['합계'].sum()
+        avg_margin = product_sales['마진율'].mean()
+
+        # 월별 판매 추이
+        monthly_sales = product_sales.groupby(['연도', '월']).agg({
+            '수량': 'sum',
+            '합계': 'sum'
+        }).reset_index()
+
+        # 구매 기업 리스트
+        customer_list = product_sales.groupby('거래처').agg({
+            '수량': 'sum',
+            '합계': 'sum',
+            '매출일': 'count'
+        }).reset_index()
+        customer_list.columns = ['거래처', '총구매수량', '총구매금액', '구매횟수']
+
+        return self._product_result(
+            product_code, total_quantity, total_revenue, avg_margin, len(product_sales),
+            monthly_sales, customer_list, limit, offset
+        )
+
+    def _product_result(self, product_code, total_quantity, total_revenue, avg_margin, transaction_count,
+                        monthly_sales, customer_list, limit=None, offset=0):
+        """제품 분석 결과 구성 (구매 기업은 필요한 페이지까지만 부분 선택)"""
+        offset = max(offset or 0, 0)
+        customers = self._top_rows(customer_list, '총구매금액', offset + limit if limit else None)
+        customers = customers.iloc[offset:]
+        next_offset = offset + limit if limit and offset + limit < len(customer_list) else None
+
+        return {
+            'product_code': product_code,
+            'total_quantity': int(total_quantity),
+            'total_revenue': int(total_revenue),
+            'avg_margin': round(avg_margin, 2),
+            'monthly_sales': monthly_sales.to_dict('records'),
+            'customers': customers.to_dict('records'),
+            'customer_count': len(customer_list),
+            'next_offset': next_offset,
+            'transaction_count': transaction_count
+        }
+
+    @staticmethod
+    def _top_rows(frame, column, n=None, ascending=False):
+        """column 기준 상위 n개 행 (n이 있으면 전체 정렬 대신 nlargest/nsmallest 부분 선택)
+
+        동점은 원래 행 순서를 유지하므로 전체 정렬(stable)과 결과 순서가 같다.
+        """
+        if n is None:
+            return frame.sort_values(column, ascending=ascending, kind='stable')
+        return frame.nsmallest(n, column) if ascending else frame.nlargest(n, column)
+
+    def _product_sales(self, product_code, start=None, end=None):
+        """제품명에 코드가 포함된 제품(예: 9322-14)의 [start, end) 기간 거래 (일치하는 제품이 없으면 None)"""
+        product_names = self._match(self._product_names, product_code)
+        if not product_names:
+            return None
+        return self.sales_data.iloc[self._product_positions(product_names, start, end)]
+
+    def _product_positions(self, product_names, start=None, end=None):
+        """제품들의 [start, end) 기간 거래 행 위치 (날짜 순)"""
+        # 제품별 행 위치를 합친 뒤 정렬 (판매 데이터가 매출일 순이므로 위치 순 = 날짜 순)
+        positions = np.sort(np.concatenate([self._product_rows[name] for name in product_names]))
+
+        if start is not None or end is not None:
+            positions = positions[positions < self._dated_rows]
+            dates = self._sale_dates[positions]
+            i = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start), 'left'))
+            j = len(positions) if end is None else int(np.searchsorted(dates, np.datetime64(end), 'left'))
+            positions = positions[i:max(i, j)]
+
+        return positions
+
+    @coalesced
+    def get_product_sales_analysis_batch(self, product_codes, start=None, end=None, region=None, industry=None,
+                                         limit=None, offset=0):
+        """여러 제품의 판매 분석 ({코드: get_product_sales_analysis와 같은 결과 또는 None}, 요청 순서 유지)
+
+        제품명 목록을 한 번 훑어 모든 코드를 찾고, 모든 제품의 거래를 합친 뒤
+        월별 추이와 구매 기업 목록을 제품 코드별 그룹 집계 한 번으로 계산한다.
+        """
+        codes = list(dict.fromkeys(product_codes))
+        start, end = self._parse_date_range(start, end)
+        matches = self._match_many(self._product_names, codes)
+
+        # 여러 코드에 일치하는 거래는 코드마다 한 번씩 포함 (_product: codes에서의 위치)
+        positions, owners = [], []
+        for i, code in enumerate(codes):
+            if matches[code]:
+                rows = self._product_positions(matches[code], start, end)
+                positions.append(rows)
+                owners.append(np.full(len(rows), i))
+        if not positions:
+            return dict.fromkeys(codes)
+
+        product_sales = self.sales_data.iloc[np.concatenate(positions)].assign(_product=np.concatenate(owners))
+
+        customers = self._customers_with(region, industry)
+        if customers is not None:
+            product_sales = product_sales[product_sales['거래처'].isin(customers)]
+
+        totals = product_sales.groupby('_product').agg(
+            수량=('수량', 'sum'), 합계=('합계', 'sum'), 마진율=('마진율', 'mean'), 거래수=('수량', 'size')
+        )
+        monthly_sales = product_sales.groupby(['_product', '연도', '월']).agg({
+            '수량': 'sum',
+            '합계': 'sum'
+        }).reset_index()
+        customer_list = product_sales.groupby(['_product', '거래처']).agg({
+            '수량': 'sum',
+            '합계': 'sum',
+            '매출일': 'count'
+        }).reset_index()
+        customer_list.columns = ['_product', '거래처', '총구매수량', '총구매금액', '구매횟수']
+
+        return self._product_batch_results(codes, totals, monthly_sales, customer_list, limit, offset)
+
+    def _product_batch_results(self, codes, totals, monthly_sales, customer_list, limit=None, offset=0):
+        """코드별 그룹 집계(_product 컬럼/인덱스 = codes에서의 위치)를 나눠 코드별 제품 분석 결과 구성"""
+        monthly_groups = dict(iter(monthly_sales.groupby('_product', sort=False)))
+        customer_groups = dict(iter(customer_list.groupby('_product', sort=False)))
+        no_months = monthly_sales.iloc[:0]
+        no_customers = customer_list.iloc[:0]
+
+        results = dict.fromkeys(codes)
+        for i, row in totals.iterrows():
+            if row['거래수'] == 0:
+                continue
+            results[codes[i]] = self._product_result(
+                codes[i], row['수량'], row['합계'], row['마진율'], int(row['거래수']),
+                monthly_groups.get(i, no_months).drop(columns='_product'),
+                customer_groups.get(i, no_customers).drop(columns='_product'),
+                limit, offset
+            )
+        return results
+
+    @coalesced
+    def get_customer_characteristics(self, customer_names):
+        """구매 기업들의 특징 분석 (고객 프로필 테이블에서 거래처 위치로 조회)"""
+        if isinstance(customer_names, str):
+            customer_names = [customer_names]
+
+        # 기업 정보 가져오기 (기업 정보 순서 유지)
+        rows = [self._profile_rows[name] for name in set(customer_names) if name in self._profile_rows]
+        if not rows:
+            return None
+        customer_info = self.customer_profiles.iloc[np.sort(np.concatenate(rows))]
+        customer_info = customer_info[customer_info['기업정보']]
+
+        if len(customer_info) == 0:
+            return None
+
+        # 통계 분석
+        characteristics = {
+            'total_customers': len(customer_info),
+            'industry_distribution': customer_info['업종'].value_counts().to_dict(),
+            'avg_employee_count': int(customer_info['직원수'].mean()) if '직원수' in customer_info.columns else 0,
+            'location_distribution': customer_info['시도'].value_counts().to_dict(),
+            'customer_grade_distribution': customer_info['고객등급'].value_counts().to_dict(),
+            'avg_growth_rate': round(customer_info['연평균성장률'].mean(), 2) if '연평균성장률' in customer_info.columns else 0,
+            'details': customer_info[['거래처', '업종', '세부 업종', '직원수', '고객등급', '시도']].to_dict('records')
+        }
+
+        return characteristics
+
+    def get_customer_profile(self, customer_name):
+        """거래처 프로필 (기업 정보 + 누적매출, 첫/최근 구매일, 구매횟수, 주요 제품, 없으면 None)
+
+        기업 정보에 같은 거래처가 여러 행이면 첫 행의 기업 정보를 사용하고 company_records에 행 수를 담는다.
+        """
+        rows = self._profile_rows.get(customer_name)
+        if rows is None:
+            return None
+
+        profile = self.customer_profiles.iloc[rows[:1]].to_dict('records')[0]
+        # 기업 정보가 없는 항목(NaN/NA)은 None (JSON 직렬화)
+        profile = {
+            key: None if not isinstance(value, list) and pd.isna(value) else value
+            for key, value in profile.items()
+        }
+        profile['company_records'] = len(rows) if profile['기업정보'] else 0
+        return profile
+
+    @coalesced
+    def get_customer_trend_analysis(self, months=6, start=None, end=None, limit=20, offset=0):
+        """최근 N개월 고객 구매 트렌드 분석
+
+        start/end로 분석 기간을 제한하고(해당 기간에 데이터가 없으면 None),
+        증가/감소/휴면 고객 목록은 각각 offset부터 limit개를 반환한다.
+        """
+        analysis = self._customer_trend_table(months, *self._parse_date_range(start, end))
+        if analysis is None:
+            return None
+
+        offset = max(offset or 0, 0)
+        page_end = offset + limit
+
+        # 증감율 계산
+        analysis['증감율'] = ((analysis[f'최근{months}개월매출'] - analysis[f'이전{months}개월매출']) /
+                           (analysis[f'이전{months}개월매출'] + 1) * 100)
+
+        increasing = analysis[analysis['증감율'] > 10]
+        decreasing = analysis[analysis['증감율'] < -10]
+        inactive = analysis[analysis[f'최근{months}개월매출'] == 0]
+
+        # 구매량 증가 고객 (상위 page_end개만 부분 선택)
+        increasing_customers = self._top_rows(increasing, '증감율', page_end).iloc[offset:]
+
+        # 구매량 감소 고객
+        decreasing_customers = self._top_rows(decreasing, '증감율', page_end, ascending=True).iloc[offset:]
+
+        # 휴면 고객 (최근 N개월 구매 없음)
+        inactive_customers = self._top_rows(inactive, '총매출', page_end).iloc[offset:]
+
+        largest = max(len(increasing), len(decreasing), len(inactive))
+
+        return {
+            'increasing_customers': increasing_customers.to_dict('records'),
+            'decreasing_customers': decreasing_customers.to_dict('records'),
+            'inactive_customers': inactive_customers.to_dict('records'),
+            'next_offset': page_end if page_end < largest else None,
+            'summary': {
+                'total_customers': len(analysis),
+                'active_customers': len(analysis[analysis[f'최근{months}개월매출'] > 0]),
+                'increasing_count': len(increasing),
+                'decreasing_count': len(decreasing),
+                'inactive_count': len(inactive)
+            }
+        }
+
+    def _customer_trend_table(self, months, start=None, end=None):
+        """고객별 총매출, 첫/최근 구매일, 구매횟수, 최근/이전 N개월 매출 집계"""
+        sales_data = self._date_window(start, end)
+        if len(sales_data) == 0:
+            return None
+
+        # 최근 날짜 기준
+        latest_date = self._last_sale_date(sales_data)
+        cutoff_date = latest_date - pd.DateOffset(months=months)
+
+        # 최근 N개월 데이터
+        recent_data = self._date_window(max(cutoff_date, start) if start else cutoff_date, end)
+
+        # 고객별 매출 집계
+        customer_total = sales_data.groupby('거래처').agg({
+            '합계': 'sum',
+            '매출일': ['min', 'max', 'count']
+        }).reset_index()
+        customer_total.columns = ['거래처', '총매출', '첫구매일', '최근구매일', '구매횟수']
+
+        # 날짜를 문자열로 변환 (JSON 직렬화 오류 방지)
+        customer_total['첫구매일'] = customer_total['첫구매일'].dt.strftime('%Y-%m-%d')
+        customer_total['최근구매일'] = customer_total['최근구매일'].dt.strftime('%Y-%m-%d')
+
+        customer_recent = recent_data.groupby('거래처')['합계'].sum().reset_index()
+        customer_recent.columns = ['거래처', f'최근{months}개월매출']
+
+        # 이전 N개월 데이터
+        previous_cutoff = cutoff_date - pd.DateOffset(months=months)
+        previous_data = self._date_window(max(previous_cutoff, start) if start else previous_cutoff, cutoff_date)
+        customer_previous = previous_data.groupby('거래처')['합계'].sum().reset_index()
+        customer_previous.columns = ['거래처', f'이전{months}개월매출']
+
+        # 데이터 병합
+        analysis = customer_total.merge(customer_recent, on='거래처', how='left')
+        analysis = analysis.merge(customer_previous, on='거래처', how='left')
+        analysis = analysis.fillna(0)
+
+        return analysis
+
+    @coalesced
+    def get_marketing_recommendations(self):
+        """마케팅 대상 추천"""
+        # 최근 6개월 트렌드 분석
+        trend = self.get_customer_trend_analysis(6)
+
+        recommendations = []
+
+        # 1. 구매량 감소 고객 - 재활성화 필요
+        for customer in trend['decreasing_customers'][:5]:
+            company_info = self.company_data[self.company_data['거래처'] == customer['거래처']]
+            recommendations.append({
+                'customer': customer['거래처'],
+                'reason': '구매량 감소',
+                'metric': f"감소율: {customer['증감율']:.1f}%",
+                'action': '재활성화 마케팅',
+                'priority': 'High',
+                'total_revenue': customer['총매출']
+            })
+
+        # 2. 휴면 고객 중 과거 매출이 높았던 고객
+        for customer in trend['inactive_customers'][:5]:
+            recommendations.append({
+                'customer': customer['거래처'],
+                'reason': '휴면 고객 (과거 우수 고객)',
+                'metric': f"과거 총매출: {customer['총매출']:,.0f}원",
+                'action': '복귀 유도 프로모션',
+                'priority': 'High',
+                'total_revenue': customer['총매출']
+            })
+
+        # 3. 구매량 증가 고객 - 더 많은 제품 제안 (함께 구매되는 제품 중 아직 구매하지 않은 제품)
+        for customer in trend['increasing_customers'][:3]:
+            suggestions = self.copurchase.suggestions_for(customer['거래처'], self.CROSS_SELL_PRODUCTS) or []
+            recommendations.append({
+                'customer': customer['거래처'],
+                'reason': '구매량 지속 증가',
+                'metric': f"증가율: {customer['증감율']:.1f}%",
+                'action': '추가 제품 교차 판매',
+                'priority': 'Medium',
+                'total_revenue': customer['총매출'],
+                'products': [item['제품명'] for item in suggestions]
+            })
+
+        return recommendations
+
+    @coalesced
+    def get_sales_summary(self, start=None, end=None):
+        """전체 판매 요약 (start/end로 기간 제한, 해당 기간에 데이터가 없으면 None)
+
+        전체 기간 요약은 채팅마다 시스템 프롬프트에 쓰이므로 데이터셋별로 한 번만 계산해 둔다.
+        """
+        if start or end:
+            return self._sales_summary(*self._parse_date_range(start, end))
+
+        if self._summary_cache is None:
+            metrics.cache_requests.inc(cache='sales_summary', result='miss')
+            self._summary_cache = self._sales_summary()
+        else:
+            metrics.cache_requests.inc(cache='sales_summary', result='hit')
+        return dict(self._summary_cache) if self._summary_cache is not None else None
+
+    def _sales_summary(self, start=None, end=None):
+        """[start, end) 기간의 판매 요약 계산"""
+        sales_data = self._date_window(start, end)
+        if len(sales_data) == 0:
+            return None
+
+        total_revenue = sales_data['합계'].sum()
+        total_transactions = len(sales_data)
+        unique_customers = sales_data['거래처'].nunique()
+        avg_transaction = total_revenue / total_transactions
+
+        # 최근 1년 매출
+        latest_date = self._last_sale_date(sales_data)
+        one_year_ago = latest_date - pd.DateOffset(years=1)
+        recent_revenue = self._date_window(max(one_year_ago, start) if start else one_year_ago, end)['합계'].sum()
+
+        return {
+            'total_revenue': int(total_revenue),
+            'total_transactions': total_transactions,
+            'unique_customers': unique_customers,
+            'avg_transaction': int(avg_transaction),
+            'recent_year_revenue': int(recent_revenue),
+            'latest_date': latest_date.strftime('%Y-%m-%d')
+        }
+
+    def get_related_products(self, product_code, limit=10):
+        """함께 구매된 제품 (두 제품을 모두 구매한 거래처 기준 유사도 순, 최대 copurchase.TOP_K개)
+
+        제품명이 정확히 일치하지 않으면 제품 코드가 포함된 첫 제품을 사용하고, 판매 기록이 없으면 None.
+        """
+        product_name = product_code
+        if not self.copurchase.has_product(product_name):
+            matches = [name for name in self._match(self._product_names, product_code) if self.copurchase.has_product(name)]
+            if not matches:
+                return None
+            product_name = matches[0]
+
+        return {
+            '제품명': product_name,
+            'customer_count': self.copurchase.customer_count(product_name),
+            'related': self.copurchase.related_products(product_name, limit)
+        }
+
+    def get_product_suggestions(self, customer_name, limit=10):
+        """거래처에 추천할 제품 (구매한 제품과 함께 구매되는 제품 중 아직 구매하지 않은 제품, 판매 기록이 없으면 None)"""
+        suggestions = self.copurchase.suggestions_for(customer_name, limit)
+        if suggestions is None:
+            return None
+        return {'거래처': customer_name, 'suggestions': suggestions}
+
+    def _rfm_segments(self):
+        """RFM 점수 테이블과 세그먼트 요약 - 고객 프로필에서 데이터셋별로 한 번 계산 (구매 기록이 없으면 None)"""
+        if self._rfm_cache is not None:
+            metrics.cache_requests.inc(cache='rfm', result='hit')
+            return self._rfm_cache
+
+        metrics.cache_requests.inc(cache='rfm', result='miss')
+        customers = self.customer_profiles.drop_duplicates('거래처')
+        customers = customers[customers['구매횟수'] > 0]
+        if len(customers) == 0:
+            return None
+
+        # 기준일: 데이터셋의 가장 최근 구매일
+        reference_date = pd.Timestamp(customers['최근구매일'].max())
+        table = rfm.segment(customers, reference_date)
+        self._rfm_cache = {
+            'reference_date': reference_date.strftime('%Y-%m-%d'),
+            'table': table,
+            'summary': rfm.summarize(table)
+        }
+        return self._rfm_cache
+
+    def get_rfm_segments(self, segment=None, limit=50, offset=0):
+        """RFM 고객 세분화 (세그먼트별 요약과 누적매출 순 고객 목록, segment로 필터, offset부터 limit개)"""
+        segments = self._rfm_segments()
+        if segments is None:
+            return None
+
+        table = segments['table']
+        if segment:
+            table = table[table['세그먼트'] == segment]
+
+        offset = max(offset or 0, 0)
+        page_end = offset + limit
+        return {
+            'reference_date': segments['reference_date'],
+            'summary': segments['summary'],
+            'segment': segment,
+            'customer_count': len(table),
+            'customers': table.iloc[offset:page_end].to_dict('records'),
+            'next_offset': page_end if page_end < len(table) else None
+        }
+
+    def dataset_stats(self):
+        """테이블별 행 수와 메모리 사용량(bytes) - 처음 호출 시 계산해 둔다 (로드 후 데이터는 바뀌지 않음)"""
+        if self._dataset_stats is None:
+            self._dataset_stats = {
+                table: {'rows': len(df), 'memory_bytes': int(df.memory_usage(deep=True).sum())}
+                for table, df in (('sales', self.sales_data), ('companies', self.company_data))
+            }
+        return self._dataset_stats
+
+    def search_products(self, keyword):
+        """제품 검색"""
+        return self._match(self._product_names, keyword)[:20]  # 상위 20개만
+
+    def search_customers(self, keyword):
+        """고객 검색"""
+        return self._match(self._customer_names, keyword)[:20]  # 상위 20개만
@@ -0,0 +1,183 @@
+"""
+Gemini 호출 래퍼 (제한 시간, 재시도, 서킷 브레이커)
+
+- 호출마다 request_options의 timeout을 넘기고, 별도 스레드에서 실행해 제한 시간이 지나면 더 기다리지 않는다
+- 일시적 오류(타임아웃, 429, 5xx, 연결 오류)는 지수 백오프에 지터를 더해 전체 제한 시간 안에서 재시도한다
+- 일시적 오류가 연속으로 쌓이면 서킷을 열고 cooldown 동안 호출 없이 바로 LLMUnavailable을 발생시킨다
+  (cooldown이 지나면 호출 하나만 시험으로 보내 성공하면 닫는다)
+"""
+import concurrent.futures
+import logging
+import random
+import threading
+import time
+
+from . import config, metrics
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 오류 (google.api_core.exceptions 클래스 이름 - 패키지를 import 하지 않고 이름으로 판단)
+RETRYABLE_ERRORS = {
+    'DeadlineExceeded', 'ServiceUnavailable', 'ResourceExhausted', 'TooManyRequests',
+    'InternalServerError', 'BadGateway', 'GatewayTimeout', 'Aborted'
+}
+
+# 재시도 간격 상한 (초)
+BACKOFF_MAX = 8
+
+retries = metrics.REGISTRY.register(metrics.Counter(
+    'b2b_llm_retries_total', 'LLM 호출 재시도 수', ()
+))
+fallbacks = metrics.REGISTRY.register(metrics.Counter(
+    'b2b_llm_fallbacks_total', 'LLM 대신 템플릿 답변을 반환한 수 (reason=circuit_open|timeout|error)', ('reason',)
+))
+circuit_open = metrics.REGISTRY.register(metrics.Gauge(
+    'b2b_llm_circuit_open', 'LLM 서킷 브레이커가 열려 있으면 1', ()
+))
+circuit_open.set(0)
+
+
+class LLMUnavailable(Exception):
+    """LLM 응답을 받지 못함 (reason: circuit_open, timeout, error)"""
+
+    def __init__(self, reason, cause=None):
+        super().__init__(f"{reason}: {cause}" if cause is not None else reason)
+        self.reason = reason
+        self.cause = cause
+
+
+class CircuitBreaker:
+    """연속 실패 threshold회에 열리고 cooldown초 후 시험 호출 하나를 허용 (threshold가 0이면 사용 안 함)"""
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._trial or time.monotonic() - self._opened_at >= self.cooldown:
+                return 'half_open'
+            return 'open'
+
+    def allow(self):
+        """지금 호출해도 되는지 (half-open이면 한 번에 하나만 허용)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._trial = True
+            return True
+
+    def success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("LLM circuit closed")
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+        circuit_open.set(0)
+
+    def release(self):
+        """장애로 보지 않는 오류(400 등)로 끝난 호출 - 실패로 세지 않고 half-open 시험 호출 자리만 반납"""
+        with self._lock:
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if not self.threshold or (self._opened_at is None and self.failures < self.threshold):
+                return
+            if self._opened_at is None:
+                logger.warning("LLM circuit opened after %d consecutive failures", self.failures)
+            self._opened_at = time.monotonic()
+        circuit_open.set(1)
+
+
+class ResilientLLMClient:
+    """start_chat/send_message를 제공하는 모델(Gemini GenerativeModel 또는 스텁)을 감싸는 클라이언트"""
+
+    def __init__(self, model, timeout=None, deadline=None, max_retries=None, backoff=None, breaker=None,
+                 max_concurrency=None):
+        self.model = model
+        self.timeout = config.LLM_TIMEOUT if timeout is None else timeout
+        self.deadline = config.LLM_DEADLINE if deadline is None else deadline
+        self.max_retries = config.LLM_RETRIES if max_retries is None else max_retries
+        self.backoff = config.LLM_BACKOFF if backoff is None else backoff
+        self.breaker = breaker or CircuitBreaker(config.LLM_BREAKER_THRESHOLD, config.LLM_BREAKER_COOLDOWN)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency or config.LLM_MAX_CONCURRENCY, thread_name_prefix='b2b-llm'
+        )
+
+    def send(self, history, message):
+        """history로 대화를 시작해 message를 보내고 (응답 객체, 응답 텍스트) 반환
+
+        제한 시간 초과, 재시도 소진, 서킷 열림이면 LLMUnavailable을 발생시킨다.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise LLMUnavailable('circuit_open')
+
+            remaining = self.deadline - (time.monotonic() - started)
+            try:
+                if remaining <= 0:
+                    raise TimeoutError(f"LLM 전체 제한 시간({self.deadline}초)을 넘었습니다")
+                result = self._call(history, message, min(self.timeout, remaining))
+            except Exception as e:
+                # 일시적 오류(타임아웃, 429, 5xx, 연결 오류)만 서비스 장애로 보고 서킷 실패로 셈
+                if self._retryable(e):
+                    self.breaker.failure()
+                else:
+                    self.breaker.release()
+                metrics.llm_errors.inc(error=type(e).__name__)
+                reason = 'timeout' if self._is_timeout(e) else 'error'
+
+                delay = random.uniform(0, min(BACKOFF_MAX, self.backoff * 2 ** attempt))
+                out_of_time = time.monotonic() - started + delay >= self.deadline
+                if attempt >= self.max_retries or out_of_time or not self._retryable(e):
+                    raise LLMUnavailable(reason, e) from e
+
+                attempt += 1
+                retries.inc()
+                logger.warning("LLM call failed (%s: %s), retry %d in %.2fs", type(e).__name__, e, attempt, delay)
+                time.sleep(delay)
+            else:
+                self.breaker.success()
+                return result
+
+    def _call(self, history, message, timeout):
+        """별도 스레드에서 호출하고 timeout초까지만 기다림"""
+        future = self._executor.submit(self._send, history, message, timeout)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            if future.done():
+                # 호출 자체가 TimeoutError로 끝난 경우
+                raise
+            # 아직 시작하지 못한 호출은 취소 (이미 실행 중인 호출은 request_options timeout으로 끝남)
+            future.cancel()
+            raise TimeoutError(f"LLM 응답이 {timeout:.1f}초 안에 오지 않았습니다") from None
+
+    def _send(self, history, message, timeout):
+        chat = self.model.start_chat(history=history)
+        response = chat.send_message(message, request_options={'timeout': timeout})
+        return response, response.text
+
+    @staticmethod
+    def _is_timeout(error):
+        return isinstance(error, TimeoutError) or type(error).__name__ == 'DeadlineExceeded'
+
+    @classmethod
+    def _retryable(cls, error):
+        return (cls._is_timeout(error) or isinstance(error, ConnectionError)
+                or type(error).__name__ in RETRYABLE_ERRORS)
@@ -0,0 +1,198 @@
+"""
+데이터 소스 로더
+
+DataProcessor는 로더에서 원본 DataFrame을 받아 전처리한다.
+로더는 파일 확장자 또는 B2B_SALES_FORMAT / B2B_COMPANY_FORMAT 설정으로 선택된다.
+
+- csv: pandas.read_csv (기본 인코딩 utf-8-sig)
+- xlsx/xls: pandas.read_excel (openpyxl 필요)
+- parquet: pandas.read_parquet (pyarrow 필요)
+- sqlite/db: sqlite3 데이터베이스의 테이블
+- DataFrame: 메모리 상의 데이터 (테스트/합성 데이터용)
+
+CSV, SQLite, DataFrame 로더는 iter_chunks()로 청크 단위 읽기를 지원한다.
+
+CSV/XLSX를 빠른 형식으로 미리 변환하려면:
+    python -m b2b_agent.loaders parquet data/
+"""
+import argparse
+import os
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+
+class DataLoader:
+    """데이터 소스 로더 기본 클래스"""
+
+    def load(self):
+        """원본 DataFrame 반환"""
+        raise NotImplementedError
+
+    def iter_chunks(self, chunksize):
+        """원본을 chunksize 행 단위 DataFrame으로 나눠 반환 (기본: 전체를 한 번에)"""
+        yield self.load()
+
+    def describe(self):
+        """로더 설명 (로그/상태 표시용)"""
+        return self.__class__.__name__
+
+    def fingerprint(self):
+        """소스 식별값 (파일이 바뀌면 달라짐). 알 수 없으면 None"""
+        return None
+
+
+class FileLoader(DataLoader):
+    """파일 기반 로더 기본 클래스"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def describe(self):
+        return f"{self.__class__.__name__}({self.path})"
+
+    def fingerprint(self):
+        stat = os.stat(self.path)
+        return f"{self.describe()}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+class CSVLoader(FileLoader):
+    """CSV 파일 로더"""
+
+    def __init__(self, path, encoding='utf-8-sig'):
+        super().__init__(path)
+        self.encoding = encoding
+
+    def load(self):
+        return pd.read_csv(self.path, encoding=self.encoding)
+
+    def iter_chunks(self, chunksize):
+        with pd.read_csv(self.path, encoding=self.encoding, chunksize=chunksize) as reader:
+            yield from reader
+
+
+class ExcelLoader(FileLoader):
+    """Excel 파일 로더"""
+
+    def load(self):
+        return pd.read_excel(self.path)
+
+
+class ParquetLoader(FileLoader):
+    """Parquet 파일 로더"""
+
+    def load(self):
+        return pd.read_parquet(self.path)
+
+
+class SQLiteLoader(FileLoader):
+    """SQLite 테이블 로더"""
+
+    def __init__(self, path, table):
+        super().__init__(path)
+        self.table = table
+
+    def load(self):
+        with closing(sqlite3.connect(self.path)) as conn:
+            return pd.read_sql_query(f'SELECT * FROM "{self.table}"', conn)
+
+    def iter_chunks(self, chunksize):
+        with closing(sqlite3.connect(self.path)) as conn:
+            yield from pd.read_sql_query(f'SELECT * FROM "{self.table}"', conn, chunksize=chunksize)
+
+    def describe(self):
+        return f"SQLiteLoader({self.path}, table={self.table})"
+
+
+class DataFrameLoader(DataLoader):
+    """메모리 DataFrame 로더 - 전처리가 원본을 바꾸지 않도록 복사본을 반환"""
+
+    def __init__(self, df):
+        self.df = df
+
+    def load(self):
+        return self.df.copy()
+
+    def iter_chunks(self, chunksize):
+        for start in range(0, len(self.df), chunksize):
+            yield self.df.iloc[start:start + chunksize].copy()
+
+    def describe(self):
+        return f"DataFrameLoader({len(self.df)} rows)"
+
+
+FORMATS = {
+    'csv': CSVLoader,
+    'xlsx': ExcelLoader,
+    'xls': ExcelLoader,
+    'parquet': ParquetLoader,
+    'sqlite': SQLiteLoader,
+    'db': SQLiteLoader,
+}
+
+
+def get_loader(source, fmt=None, table=None):
+    """경로/DataFrame/로더에서 로더 생성 (fmt를 주지 않으면 확장자로 판단)"""
+    if isinstance(source, DataLoader):
+        return source
+    if isinstance(source, pd.DataFrame):
+        return DataFrameLoader(source)
+
+    fmt = (fmt or os.path.splitext(source)[1].lstrip('.')).lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 데이터 형식입니다: {fmt or source} (지원: {', '.join(sorted(FORMATS))})")
+
+    loader_class = FORMATS[fmt]
+    if loader_class is SQLiteLoader:
+        if not table:
+            raise ValueError(f"SQLite 소스에는 테이블 이름이 필요합니다: {source}")
+        return SQLiteLoader(source, table)
+    return loader_class(source)
+
+
+def save_dataframe(df, path, fmt=None, table=None):
+    """DataFrame을 지정한 형식으로 저장 (빠른 형식으로 미리 변환할 때 사용)"""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+    if fmt == 'csv':
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    elif fmt in ('xlsx', 'xls'):
+        df.to_excel(path, index=False)
+    elif fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt in ('sqlite', 'db'):
+        with closing(sqlite3.connect(path)) as conn:
+            df.to_sql(table, conn, if_exists='replace', index=False)
+            conn.commit()
+    else:
+        raise ValueError(f"지원하지 않는 데이터 형식입니다: {fmt}")
+
+
+def main():
+    """설정된 데이터 소스를 전처리한 뒤 빠른 형식으로 변환"""
+    from .data_processor import DataProcessor
+
+    parser = argparse.ArgumentParser(description='데이터 파일을 parquet/sqlite로 변환')
+    parser.add_argument('format', choices=['parquet', 'sqlite'], help='변환할 형식')
+    parser.add_argument('out_dir', help='출력 디렉토리')
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    processor = DataProcessor()
+
+    if args.format == 'parquet':
+        sales_path = os.path.join(args.out_dir, 'sales.parquet')
+        company_path = os.path.join(args.out_dir, 'companies.parquet')
+        save_dataframe(processor.sales_data, sales_path)
+        save_dataframe(processor.company_data, company_path)
+    else:
+        sales_path = company_path = os.path.join(args.out_dir, 'b2b.sqlite')
+        save_dataframe(processor.sales_data, sales_path, table='sales')
+        save_dataframe(processor.company_data, company_path, table='companies')
+
+    print(f"판매 데이터: {sales_path} ({len(processor.sales_data)} rows)")
+    print(f"기업 데이터: {company_path} ({len(processor.company_data)} rows)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Prometheus 텍스트 형식 메트릭 (/metrics)
+
+외부 클라이언트 라이브러리 없이 카운터, 게이지, 히스토그램을 프로세스 메모리에 집계한다.
+gunicorn 워커가 여러 개면 워커마다 따로 집계되므로 스크레이프한 워커의 값만 보인다.
+"""
+import threading
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 지연 시간 히스토그램 기본 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """레이블 조합별 값을 저장하는 메트릭 기본 클래스"""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 레이블이 맞지 않습니다: {sorted(labels)} (필요: {list(self.labelnames)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self):
+        """(이름 접미사, 레이블 값, 추가 레이블, 값) 목록"""
+        with self._lock:
+            return [('', key, (), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        for suffix, key, extra, value in self.samples():
+            labels = _format_labels(self.labelnames, key, extra)
+            lines.append(f'{self.name}{suffix}{labels} {_format_value(value)}')
+        return lines
+
+
+class Counter(Metric):
+    """증가만 하는 누적 값"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """현재 값 (callback을 주면 스크레이프할 때 {레이블 값 튜플: 값} 딕셔너리를 받아 사용)"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(), callback=None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        if self.callback is None:
+            return super().samples()
+        values = self.callback() or {}
+        return [('', tuple(str(v) for v in key), (), value) for key, value in sorted(values.items())]
+
+
+class Histogram(Metric):
+    """관측값 분포 (누적 구간별 개수, 합계, 개수)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['buckets'][i] += 1
+                    break
+            state['sum'] += value
+            state['count'] += 1
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, state in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, state['buckets']):
+                    cumulative += count
+                    samples.append(('_bucket', key, (('le', _format_value(bound)),), cumulative))
+                samples.append(('_sum', key, (), state['sum']))
+                samples.append(('_count', key, (), state['count']))
+        return samples
+
+
+class Registry:
+    """메트릭 모음"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+http_requests = REGISTRY.register(Counter(
+    'b2b_http_requests_total', 'HTTP 요청 수', ('route', 'method', 'status')
+))
+http_request_duration = REGISTRY.register(Histogram(
+    'b2b_http_request_duration_seconds', 'HTTP 요청 처리 시간', ('route', 'method')
+))
+cache_requests = REGISTRY.register(Counter(
+    'b2b_cache_requests_total', '캐시 조회 수 (result=hit|miss)', ('cache', 'result')
+))
+llm_request_duration = REGISTRY.register(Histogram(
+    'b2b_llm_request_duration_seconds', 'LLM 호출 시간', ()
+))
+llm_errors = REGISTRY.register(Counter(
+    'b2b_llm_errors_total', 'LLM 호출 오류 수', ('error',)
+))
+llm_tokens = REGISTRY.register(Counter(
+    'b2b_llm_tokens_total', 'LLM 토큰 수 (kind=prompt|response, usage_metadata가 없으면 추정치)', ('kind',)
+))
+llm_prompt_tokens = REGISTRY.register(Histogram(
+    'b2b_llm_prompt_tokens', '요청별 LLM 프롬프트 토큰 수', (),
+    buckets=(500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+))
+dataset_reloads = REGISTRY.register(Counter(
+    'b2b_dataset_reloads_total', '데이터셋 리로드 수 (result=success|failure)', ('result',)
+))
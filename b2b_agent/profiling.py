@@ -0,0 +1,185 @@
+"""
+요청 프로파일링 (opt-in)
+
+- B2B_PROFILE_HEADER=1: `X-B2B-Profile: 1` 헤더가 있는 요청을 cProfile로 프로파일링해 .prof(pstats)로 저장
+- B2B_PROFILE_THRESHOLD_MS=N: 모든 요청 스레드의 스택을 sys._current_frames()로 주기적으로 샘플링하고,
+  N ms보다 오래 걸린 요청만 collapsed stack 형식(.collapsed, flamegraph.pl/speedscope 호환)으로 저장
+
+프로파일 옆에는 라우트, 파라미터 이름, 요청 본문 크기, 소요 시간, 데이터셋 버전을 담은 .json이 함께 저장되며
+(채팅 메시지 등 파라미터/본문 값은 저장하지 않음),
+B2B_PROFILE_DIR에는 최근 B2B_PROFILE_KEEP개만 유지된다.
+"""
+import collections
+import cProfile
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'X-B2B-Profile'
+
+
+def enabled():
+    return config.PROFILE_HEADER or config.PROFILE_THRESHOLD_MS > 0
+
+
+def _collapse(frame):
+    """프레임 스택을 'a (file:line);b (file:line);...' 형식(바깥 호출이 먼저)으로 변환"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class SamplingProfiler:
+    """등록된 요청 스레드의 스택을 interval마다 수집하는 백그라운드 샘플러"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, thread_id):
+        with self._lock:
+            self._active[thread_id] = collections.Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='b2b-profiler', daemon=True)
+                self._thread.start()
+
+    def stop(self, thread_id):
+        """수집을 멈추고 {스택: 샘플 수} 반환"""
+        with self._lock:
+            return self._active.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    continue
+                thread_ids = list(self._active)
+
+            frames = sys._current_frames()
+            stacks = {tid: _collapse(frames[tid]) for tid in thread_ids if tid in frames}
+            with self._lock:
+                for tid, stack in stacks.items():
+                    counter = self._active.get(tid)
+                    if counter is not None:
+                        counter[stack] += 1
+
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def _get_sampler():
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = SamplingProfiler(config.PROFILE_INTERVAL_MS / 1000)
+        return _sampler
+
+
+def start(state, headers):
+    """요청 시작 시 프로파일링 시작 (state: 요청별 저장소, 예: flask.g)"""
+    if config.PROFILE_HEADER and headers.get(PROFILE_HEADER, '').lower() in ('1', 'true', 'yes'):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # 다른 프로파일러가 이미 동작 중 (동시에 하나만 가능한 환경)
+            return
+        state.profiler = profiler
+    elif config.PROFILE_THRESHOLD_MS > 0:
+        state.profile_thread = threading.get_ident()
+        _get_sampler().start(state.profile_thread)
+
+
+def finish(state, elapsed, metadata):
+    """요청 종료 시 프로파일링을 멈추고 조건에 맞으면 저장, 저장한 파일 경로 반환"""
+    profiler = state.pop('profiler', None)
+    thread_id = state.pop('profile_thread', None)
+    elapsed_ms = round(elapsed * 1000, 3)
+
+    if profiler is not None:
+        profiler.disable()
+        return _save(metadata, elapsed_ms, 'header', '.prof', profiler.dump_stats)
+
+    if thread_id is not None:
+        samples = _get_sampler().stop(thread_id)
+        if not samples or elapsed_ms < config.PROFILE_THRESHOLD_MS:
+            return None
+
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in samples.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        metadata = dict(metadata, samples=sum(samples.values()), interval_ms=config.PROFILE_INTERVAL_MS)
+        return _save(metadata, elapsed_ms, 'threshold', '.collapsed', write)
+
+    return None
+
+
+def discard(state):
+    """저장하지 않고 프로파일링 중지 (after_request 없이 끝난 요청)"""
+    profiler = state.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+    thread_id = state.pop('profile_thread', None)
+    if thread_id is not None:
+        _get_sampler().stop(thread_id)
+
+
+def _save(metadata, elapsed_ms, trigger, extension, write):
+    """프로파일과 메타데이터(.json) 저장 후 보관 개수 정리"""
+    try:
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', metadata.get('route', '')).strip('_') or 'root'
+        stem = os.path.join(
+            config.PROFILE_DIR,
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{int(elapsed_ms)}ms-{slug}-{os.getpid()}-{threading.get_ident()}"
+        )
+        write(stem + extension)
+        with open(stem + '.json', 'w', encoding='utf-8') as f:
+            json.dump(dict(
+                metadata,
+                trigger=trigger,
+                duration_ms=elapsed_ms,
+                threshold_ms=config.PROFILE_THRESHOLD_MS or None,
+                profile=os.path.basename(stem + extension),
+                pid=os.getpid(),
+                created_at=time.strftime('%Y-%m-%dT%H:%M:%S%z')
+            ), f, ensure_ascii=False, indent=2)
+        _enforce_retention()
+        logger.info("profile saved: %s (%s, %.1fms)", stem + extension, trigger, elapsed_ms)
+        return stem + extension
+    except OSError as e:
+        logger.warning("profile save failed: %s", e)
+        return None
+
+
+def _enforce_retention():
+    """최근 PROFILE_KEEP개의 프로파일(.json 기준)만 남기고 삭제"""
+    entries = sorted(
+        (entry for entry in os.scandir(config.PROFILE_DIR) if entry.name.endswith('.json')),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    for entry in entries[config.PROFILE_KEEP:]:
+        stem = entry.path[:-len('.json')]
+        for extension in ('.json', '.prof', '.collapsed'):
+            try:
+                os.remove(stem + extension)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,82 @@
+"""
+RFM 고객 세분화
+
+거래처별 최근 구매 후 경과일수(Recency), 구매횟수(Frequency), 누적매출(Monetary)을 전체 고객 안에서의
+백분위 순위로 1~5점을 매기고, 점수 조합 규칙(SEGMENTS, 위에서부터 먼저 맞는 규칙)으로 세그먼트를 정한다.
+모든 고객을 한 번에 벡터 연산으로 계산한다.
+"""
+import numpy as np
+import pandas as pd
+
+# 점수 단계 수 (5분위)
+QUANTILES = 5
+
+# (세그먼트, 조건, 권장 액션) - r, f, m은 1~5점 Series
+SEGMENTS = [
+    ('챔피언', lambda r, f, m: (r >= 4) & (f >= 4) & (m >= 4), '신제품 우선 안내, 로열티 혜택'),
+    ('충성고객', lambda r, f, m: (r >= 3) & (f >= 4), '추가 제품 교차 판매'),
+    ('이탈위험 우수고객', lambda r, f, m: (r <= 2) & (m >= 4), '담당자 직접 연락, 맞춤 재구매 제안'),
+    ('신규고객', lambda r, f, m: (r >= 4) & (f <= 2), '첫 거래 후속 안내, 재구매 유도'),
+    ('잠재충성고객', lambda r, f, m: (r >= 3) & (f >= 2), '구매 주기 관리, 묶음 제안'),
+    ('관심필요', lambda r, f, m: r >= 3, '관심 제품 파악, 소량 프로모션'),
+    ('이탈위험', lambda r, f, m: r == 2, '재활성화 마케팅'),
+    ('휴면', lambda r, f, m: r <= 1, '복귀 유도 프로모션'),
+]
+
+SEGMENT_LABELS = [label for label, _, _ in SEGMENTS]
+
+
+def _score(values, ascending=True):
+    """백분위 순위를 1~QUANTILES점으로 변환 (동점은 같은 점수, ascending=False면 값이 작을수록 높은 점수)"""
+    pct = values.rank(method='average', pct=True, ascending=ascending)
+    return np.ceil(pct * QUANTILES).clip(1, QUANTILES).astype(int)
+
+
+def segment(customers, reference_date):
+    """거래처, 최근구매일, 구매횟수, 누적매출 컬럼에서 RFM 점수와 세그먼트 계산 (구매 기록이 있는 거래처만, 누적매출 순)"""
+    customers = customers[customers['구매횟수'] > 0]
+    table = pd.DataFrame({
+        '거래처': customers['거래처'].to_numpy(),
+        '최근구매일': customers['최근구매일'].to_numpy(),
+        '경과일수': (reference_date - pd.to_datetime(customers['최근구매일'])).dt.days.to_numpy(),
+        '구매횟수': customers['구매횟수'].to_numpy(),
+        '누적매출': customers['누적매출'].to_numpy()
+    })
+
+    r = _score(table['경과일수'], ascending=False)
+    f = _score(table['구매횟수'])
+    m = _score(table['누적매출'])
+    table['R'], table['F'], table['M'] = r, f, m
+    table['RFM'] = r.astype(str) + f.astype(str) + m.astype(str)
+    table['세그먼트'] = np.select([rule(r, f, m) for _, rule, _ in SEGMENTS], SEGMENT_LABELS, default=SEGMENT_LABELS[-1])
+
+    return table.sort_values('누적매출', ascending=False, kind='stable', ignore_index=True)
+
+
+def summarize(table):
+    """세그먼트별 고객 수, 매출 합계/비중, 평균 경과일수/구매횟수/매출, 권장 액션 (SEGMENTS 순서)"""
+    grouped = table.groupby('세그먼트').agg(
+        count=('거래처', 'size'),
+        revenue=('누적매출', 'sum'),
+        avg_recency_days=('경과일수', 'mean'),
+        avg_frequency=('구매횟수', 'mean'),
+        avg_monetary=('누적매출', 'mean')
+    )
+    total_revenue = table['누적매출'].sum()
+
+    summary = []
+    for label, _, action in SEGMENTS:
+        if label not in grouped.index:
+            continue
+        row = grouped.loc[label]
+        summary.append({
+            'segment': label,
+            'count': int(row['count']),
+            'revenue': int(row['revenue']),
+            'revenue_share': float(round(row['revenue'] / total_revenue * 100, 2)) if total_revenue else 0,
+            'avg_recency_days': float(round(row['avg_recency_days'], 1)),
+            'avg_frequency': float(round(row['avg_frequency'], 1)),
+            'avg_monetary': int(row['avg_monetary']),
+            'action': action
+        })
+    return summary
@@ -0,0 +1,605 @@
+"""/api 라우트 - app.py와 api/index.py가 함께 등록하는 Flask Blueprint"""
+from flask import Blueprint, Response, g, make_response, request, jsonify
+import functools
+import json
+import time
+
+from . import answers, config, metrics, profiling, runtime
+from .singleflight import SingleFlight
+from .timing import Timings
+from .visualizer import DataVisualizer
+
+api = Blueprint('api', __name__)
+
+# 분석 API의 동시 동일 요청 합치기
+_analytics_flight = SingleFlight('analytics')
+
+def coalesced(view):
+    """같은 데이터셋 버전에 대한 동시 동일 요청(경로 + 쿼리)은 한 번만 처리하고 응답을 함께 사용"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            key = (
+                request.path,
+                tuple(sorted(request.args.items(multi=True))),
+                getattr(runtime.get_data_processor(), 'version', None)
+            )
+        except Exception as e:
+            # 데이터 로드 실패 등 - 다른 API와 같은 JSON 오류 응답
+            return jsonify({
+                'error': str(e),
+                'success': False
+            }), 500
+
+        def render():
+            response = make_response(view(*args, **kwargs))
+            return response.get_data(), response.status_code, response.mimetype
+
+        body, status, mimetype = _analytics_flight.do(key, render)
+        return Response(body, status=status, mimetype=mimetype)
+    return wrapper
+
+@api.before_app_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    if profiling.enabled():
+        profiling.start(g, request.headers)
+
+@api.after_app_request
+def _record_request_metrics(response):
+    """라우트별 요청 수와 처리 시간 (라우트는 URL 패턴 기준으로 집계), 프로파일 저장"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.http_requests.inc(route=route, method=request.method, status=response.status_code)
+        metrics.http_request_duration.observe(elapsed, route=route, method=request.method)
+
+        if profiling.enabled():
+            data_processor = runtime.data_processor
+            # 사용자 입력(채팅 메시지, 거래처명 등)은 저장하지 않고 파라미터 이름과 본문 크기만 남김
+            body = request.get_json(silent=True)
+            profiling.finish(g, elapsed, {
+                'route': route,
+                'method': request.method,
+                'args': sorted(request.args.keys()),
+                'view_args': sorted(request.view_args or {}),
+                'body_keys': sorted(body) if isinstance(body, dict) else [],
+                'body_bytes': request.content_length or 0,
+                'status': response.status_code,
+                'dataset_version': getattr(data_processor, 'version', None)
+            })
+    return response
+
+@api.teardown_app_request
+def _stop_profiling(exc):
+    """after_request 없이 끝난 요청의 프로파일러 정리"""
+    if profiling.enabled():
+        profiling.discard(g)
+
+@api.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus 메트릭 (텍스트 형식)"""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+@api.route('/api/health/ready', methods=['GET'])
+def health_ready():
+    """준비 상태 확인 (워밍업 완료 여부)"""
+    state = runtime.readiness()
+    return jsonify(state), 200 if state['ready'] else 503
+
+def _debug_requested(data=None):
+    """요청 본문의 "debug": true 또는 ?debug=1 여부"""
+    if data and data.get('debug'):
+        return True
+    return request.args.get('debug', '').lower() in ('1', 'true', 'yes')
+
+@api.route('/api/reload', methods=['POST'])
+def reload_data():
+    """데이터 파일을 다시 읽어 새 데이터셋으로 교체 (백그라운드, 진행 중인 요청은 기존 데이터셋으로 처리)
+
+    이 워커는 바로 리로드하고, 같은 서버의 다른 워커들은 리로드 신호 파일을 보고 1초 안에 따라 리로드한다.
+
+    리로드는 데이터셋 전체를 다시 만들고 교체 중에는 메모리를 두 배로 쓰므로 B2B_RELOAD_TOKEN이 설정된 경우에만 허용한다.
+    """
+    if not config.RELOAD_TOKEN:
+        return jsonify({
+            'error': '리로드 API가 비활성화되어 있습니다. B2B_RELOAD_TOKEN을 설정하세요.',
+            'success': False
+        }), 403
+    if request.headers.get('X-B2B-Reload-Token') != config.RELOAD_TOKEN:
+        return jsonify({
+            'error': '리로드 권한이 없습니다.',
+            'success': False
+        }), 403
+
+    started = runtime.start_reload('manual')
+    # 같은 서버의 다른 워커들은 신호 파일을 보고 따라 리로드
+    signaled = runtime.signal_reload()
+    return jsonify({
+        'started': started,
+        'signaled': signaled,
+        'message': '데이터 리로드를 시작했습니다.' if started else '이미 데이터 리로드가 진행 중입니다.',
+        'dataset_version': getattr(runtime.data_processor, 'version', None),
+        'reload': runtime.reload_state,
+        'success': True
+    }), 202
+
+@api.route('/api/chat', methods=['POST'])
+def chat():
+    """채팅 API (answer_mode로 답변 방식 선택, debug 요청 시 단계별 소요 시간 debug_timings 포함)"""
+    try:
+        data = request.json
+        user_message = data.get('message', '')
+
+        if not user_message:
+            return jsonify({'error': '메시지가 필요합니다.'}), 400
+
+        answer_mode = data.get('answer_mode') or request.args.get('answer_mode')
+        if answer_mode and answer_mode not in answers.ANSWER_MODES:
+            return jsonify({
+                'error': f"잘못된 답변 모드입니다: {answer_mode} (가능한 값: {', '.join(answers.ANSWER_MODES)})",
+                'success': False
+            }), 400
+
+        timings = Timings()
+
+        # AI Agent 응답 생성
+        with timings.span('get_agent'):
+            agent = runtime.get_agent()
+        result = agent.chat(
+            user_message, timings=timings, session_id=data.get('session_id'), answer_mode=answer_mode
+        )
+
+        # 시각화 생성
+        visualizations = []
+        with timings.span('visualize'):
+            for viz_suggestion in result.get('visualizations', []):
+                viz_json = DataVisualizer.create_visualization_from_suggestion(
+                    viz_suggestion,
+                    result['analysis_data']
+                )
+                if viz_json:
+                    visualizations.append({
+                        'title': viz_suggestion['title'],
+                        'chart': json.loads(viz_json)
+                    })
+
+        payload = {
+            'response': result['response'],
+            'visualizations': visualizations,
+            'answer_mode': result.get('answer_mode', 'llm'),
+            'success': True
+        }
+        if result.get('usage'):
+            # 이번 요청의 프롬프트/응답 토큰 수와 그중 대화 히스토리/요약이 차지한 토큰 수
+            payload['usage'] = result['usage']
+        if result.get('fallback'):
+            # LLM 대신 템플릿으로 만든 답변 (circuit_open, timeout, error)
+            payload['fallback'] = result['fallback']
+        if _debug_requested(data):
+            payload['debug_timings'] = timings.as_dict()
+
+        with timings.span('response_encode'):
+            response = jsonify(payload)
+        timings.set(response_bytes_total=response.content_length)
+        timings.log('chat')
+
+        return response
+
+    except ValueError as e:
+        return jsonify({
+            'error': f'Configuration error: {str(e)}',
+            'success': False
+        }), 500
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/reset', methods=['POST'])
+def reset_conversation():
+    """대화 히스토리 초기화"""
+    try:
+        data = request.get_json(silent=True) or {}
+        runtime.get_agent().reset_conversation(data.get('session_id'))
+        return jsonify({
+            'message': '대화가 초기화되었습니다.',
+            'success': True
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/search/products', methods=['GET'])
+def search_products():
+    """제품 검색"""
+    try:
+        keyword = request.args.get('keyword', '')
+        products = runtime.get_data_processor().search_products(keyword)
+        return jsonify({
+            'products': products,
+            'success': True
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/search/customers', methods=['GET'])
+def search_customers():
+    """고객 검색"""
+    try:
+        keyword = request.args.get('keyword', '')
+        customers = runtime.get_data_processor().search_customers(keyword)
+        return jsonify({
+            'customers': customers,
+            'success': True
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/customers/<path:customer_name>', methods=['GET'])
+def get_customer_profile(customer_name):
+    """거래처 프로필 (기업 정보 + 누적매출, 첫/최근 구매일, 구매횟수, 주요 제품)"""
+    try:
+        profile = runtime.get_data_processor().get_customer_profile(customer_name.strip())
+        if profile is None:
+            return jsonify({
+                'error': '거래처를 찾을 수 없습니다.',
+                'success': False
+            }), 404
+
+        return jsonify({
+            'profile': profile,
+            'success': True
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/customers/<path:customer_name>/recommendations', methods=['GET'])
+def get_customer_recommendations(customer_name):
+    """거래처 추천 제품 (구매한 제품과 함께 구매되는 제품 중 아직 구매하지 않은 제품, limit 최대 copurchase.TOP_K)"""
+    limit = request.args.get('limit', 10, type=int)
+    limit_error = _recommendation_limit_error(limit)
+    if limit_error:
+        return limit_error
+
+    try:
+        suggestions = runtime.get_data_processor().get_product_suggestions(customer_name.strip(), limit)
+        if suggestions is None:
+            return jsonify({
+                'error': '판매 기록이 있는 거래처를 찾을 수 없습니다.',
+                'success': False
+            }), 404
+
+        return jsonify({
+            'recommendations': suggestions,
+            'success': True
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+def _recommendation_limit_error(limit):
+    """추천 개수 검증 (1 ~ copurchase.TOP_K, 잘못되면 400 응답)"""
+    # copurchase는 pandas/numpy를 import 하므로 콜드 스타트에 포함되지 않도록 요청 시 import
+    from . import copurchase
+
+    if not 1 <= limit <= copurchase.TOP_K:
+        return jsonify({
+            'error': f'limit은 1 이상 {copurchase.TOP_K} 이하여야 합니다.',
+            'success': False
+        }), 400
+    return None
+
+def _page_error(limit, offset):
+    """limit/offset 페이지 값 검증 (잘못되면 400 응답)"""
+    if (limit is not None and limit < 1) or offset < 0:
+        return jsonify({
+            'error': '잘못된 페이지 값입니다: limit은 1 이상, offset은 0 이상이어야 합니다.',
+            'success': False
+        }), 400
+    return None
+
+@api.route('/api/analytics/product/<product_code>', methods=['GET'])
+@coalesced
+def get_product_analytics(product_code):
+    """제품 분석 API (구매 기업 목록은 limit/offset으로 페이지 단위 조회)"""
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', 0, type=int)
+    page_error = _page_error(limit, offset)
+    if page_error:
+        return page_error
+
+    try:
+        analysis = runtime.get_data_processor().get_product_sales_analysis(
+            product_code,
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            region=request.args.get('region'),
+            industry=request.args.get('industry'),
+            limit=limit,
+            offset=offset
+        )
+
+        if not analysis:
+            return jsonify({
+                'error': '제품을 찾을 수 없습니다.',
+                'success': False
+            }), 404
+
+        # 시각화 생성
+        visualizations = []
+
+        # 월별 판매 추이
+        if analysis.get('monthly_sales'):
+            monthly_chart = DataVisualizer.create_monthly_sales_chart(
+                analysis['monthly_sales'],
+                product_code
+            )
+            visualizations.append({
+                'title': '월별 판매 추이',
+                'chart': json.loads(monthly_chart)
+            })
+
+        # 주요 고객
+        if analysis.get('customers'):
+            customer_chart = DataVisualizer.create_customer_ranking_chart(
+                analysis['customers'],
+                '총구매금액',
+                15
+            )
+            visualizations.append({
+                'title': '주요 구매 고객',
+                'chart': json.loads(customer_chart)
+            })
+
+        return jsonify({
+            'analysis': analysis,
+            'visualizations': visualizations,
+            'success': True
+        })
+
+    except ValueError as e:
+        return jsonify({
+            'error': f'잘못된 기간입니다: {str(e)}',
+            'success': False
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+# 일괄 제품 분석 한 번에 조회할 수 있는 최대 제품 코드 수
+MAX_BATCH_CODES = 50
+
+@api.route('/api/analytics/products', methods=['GET'])
+@coalesced
+def get_products_analytics():
+    """여러 제품 분석 API (codes=9322-14,GPL 또는 codes를 반복, 조건과 페이지는 제품별 조회와 같음)"""
+    codes = [code.strip() for value in request.args.getlist('codes') for code in value.split(',') if code.strip()]
+    if not codes:
+        return jsonify({'error': '제품 코드(codes)가 필요합니다.', 'success': False}), 400
+    if len(codes) > MAX_BATCH_CODES:
+        return jsonify({
+            'error': f'제품 코드는 한 번에 {MAX_BATCH_CODES}개까지 조회할 수 있습니다.',
+            'success': False
+        }), 400
+
+    limit = request.args.get('limit', type=int)
+    offset = request.args.get('offset', 0, type=int)
+    page_error = _page_error(limit, offset)
+    if page_error:
+        return page_error
+
+    try:
+        analyses = runtime.get_data_processor().get_product_sales_analysis_batch(
+            codes,
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            region=request.args.get('region'),
+            industry=request.args.get('industry'),
+            limit=limit,
+            offset=offset
+        )
+
+        return jsonify({
+            'analyses': analyses,
+            'not_found': [code for code, analysis in analyses.items() if analysis is None],
+            'success': True
+        })
+
+    except ValueError as e:
+        return jsonify({
+            'error': f'잘못된 기간입니다: {str(e)}',
+            'success': False
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/analytics/product/<product_code>/related', methods=['GET'])
+def get_related_products(product_code):
+    """함께 구매된 제품 API (두 제품을 모두 구매한 거래처 기준 유사도 순, limit 최대 copurchase.TOP_K)"""
+    limit = request.args.get('limit', 10, type=int)
+    limit_error = _recommendation_limit_error(limit)
+    if limit_error:
+        return limit_error
+
+    try:
+        related = runtime.get_data_processor().get_related_products(product_code, limit)
+        if related is None:
+            return jsonify({
+                'error': '제품을 찾을 수 없습니다.',
+                'success': False
+            }), 404
+
+        return jsonify({
+            'related': related,
+            'success': True
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/analytics/segments', methods=['GET'])
+@coalesced
+def get_segments_analytics():
+    """RFM 고객 세분화 API (세그먼트별 요약 + 누적매출 순 고객 목록, segment로 필터, limit/offset 페이지)"""
+    # rfm은 pandas/numpy를 import 하므로 콜드 스타트에 포함되지 않도록 요청 시 import
+    from . import rfm
+
+    segment = request.args.get('segment')
+    if segment and segment not in rfm.SEGMENT_LABELS:
+        return jsonify({
+            'error': f"알 수 없는 세그먼트입니다: {segment} (가능한 값: {', '.join(rfm.SEGMENT_LABELS)})",
+            'success': False
+        }), 400
+
+    limit = request.args.get('limit', 50, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    page_error = _page_error(limit, offset)
+    if page_error:
+        return page_error
+
+    try:
+        segments = runtime.get_data_processor().get_rfm_segments(segment, limit=limit, offset=offset)
+        if segments is None:
+            return jsonify({
+                'error': '구매 기록이 있는 거래처가 없습니다.',
+                'success': False
+            }), 404
+
+        return jsonify({
+            'segments': segments,
+            'success': True
+        })
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/analytics/trends', methods=['GET'])
+@coalesced
+def get_trends():
+    """트렌드 분석 API (고객 목록은 limit/offset으로 페이지 단위 조회)"""
+    limit = request.args.get('limit', 20, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    page_error = _page_error(limit, offset)
+    if page_error:
+        return page_error
+
+    try:
+        months = request.args.get('months', 6, type=int)
+        trends = runtime.get_data_processor().get_customer_trend_analysis(
+            months,
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            limit=limit,
+            offset=offset
+        )
+
+        if trends is None:
+            return jsonify({
+                'error': '해당 기간의 데이터가 없습니다.',
+                'success': False
+            }), 404
+
+        # 시각화 생성
+        visualizations = []
+
+        # 트렌드 비교 차트
+        if trends.get('increasing_customers') and trends.get('decreasing_customers'):
+            trend_chart = DataVisualizer.create_trend_comparison_chart(
+                trends['increasing_customers'],
+                trends['decreasing_customers']
+            )
+            visualizations.append({
+                'title': '고객 구매 트렌드',
+                'chart': json.loads(trend_chart)
+            })
+
+        return jsonify({
+            'trends': trends,
+            'visualizations': visualizations,
+            'success': True
+        })
+
+    except ValueError as e:
+        return jsonify({
+            'error': f'잘못된 기간입니다: {str(e)}',
+            'success': False
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/analytics/marketing', methods=['GET'])
+@coalesced
+def get_marketing_recommendations():
+    """마케팅 추천 API"""
+    try:
+        recommendations = runtime.get_data_processor().get_marketing_recommendations()
+
+        return jsonify({
+            'recommendations': recommendations,
+            'success': True
+        })
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@api.route('/api/summary', methods=['GET'])
+@coalesced
+def get_summary():
+    """전체 요약 정보"""
+    try:
+        summary = runtime.get_data_processor().get_sales_summary(
+            start=request.args.get('start'),
+            end=request.args.get('end')
+        )
+
+        if summary is None:
+            return jsonify({
+                'error': '해당 기간의 데이터가 없습니다.',
+                'success': False
+            }), 404
+
+        return jsonify({
+            'summary': summary,
+            'success': True
+        })
+    except ValueError as e:
+        return jsonify({
+            'error': f'잘못된 기간입니다: {str(e)}',
+            'success': False
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
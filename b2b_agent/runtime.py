@@ -0,0 +1,308 @@
+"""
+프로세스 단위 DataProcessor / AI Agent 제공자와 워밍업, 데이터 핫 리로드
+
+분석 API는 DataProcessor만 사용하므로 Gemini SDK 없이도 동작한다.
+pandas, google.generativeai 등 무거운 모듈은 처음 필요할 때 import 한다 (콜드 스타트 단축).
+
+DataProcessor는 로드 후 바뀌지 않는 데이터셋 버전으로 취급한다. 리로드는 새 인스턴스를
+백그라운드에서 만든 뒤 참조만 교체하므로, 진행 중인 요청은 기존 인스턴스로 끝까지 처리된다.
+수동 리로드는 신호 파일(B2B_RELOAD_SIGNAL)의 수정 시각을 갱신해 같은 서버의 다른 워커들도 따라 리로드하게 한다.
+"""
+import os
+import threading
+import time
+
+from . import config, metrics
+from .singleflight import SingleFlight
+
+# DataProcessor / AI Agent 초기화 (lazy loading)
+data_processor = None
+agent = None
+
+warmup_state = {
+    'status': 'pending' if config.WARMUP_MODE else 'disabled',
+    'started_at': None,
+    'finished_at': None,
+    'error': None
+}
+_warmup_lock = threading.Lock()
+
+reload_state = {
+    'status': 'idle',
+    'reason': None,
+    'started_at': None,
+    'finished_at': None,
+    'error': None
+}
+_reload_lock = threading.Lock()
+_watcher = None
+
+# 리로드 신호 파일 확인 간격 (초)
+SIGNAL_INTERVAL = 1.0
+# 이 워커가 마지막으로 따른 리로드 신호 (신호 파일 수정 시각, ns)
+_signal_seen = None
+
+# 첫 요청이 몰려도 DataProcessor / Agent는 하나만 만들고 나머지 스레드는 완료를 기다림
+_init_flight = SingleFlight('init')
+
+
+def create_data_processor():
+    """설정된 백엔드(B2B_BACKEND)로 DataProcessor 생성"""
+    if config.BACKEND == 'sqlite':
+        from .sql_processor import SQLiteDataProcessor
+        return SQLiteDataProcessor()
+    if config.BACKEND != 'pandas':
+        raise ValueError(f"지원하지 않는 B2B_BACKEND 입니다: {config.BACKEND} (pandas, sqlite)")
+
+    from .data_processor import DataProcessor
+    return DataProcessor()
+
+
+def get_data_processor():
+    """DataProcessor 싱글톤 패턴 (프로세스 전체에서 공유, 동시 첫 호출은 한 번의 로드를 기다림)"""
+    if data_processor is None:
+        _init_flight.do('data_processor', _init_data_processor)
+    return data_processor
+
+
+def _init_data_processor():
+    global data_processor, _signal_seen
+    # 앞서 끝난 초기화가 이미 만든 경우
+    if data_processor is None:
+        # 로드 전에 읽어 두어, 로드 중에 들어온 신호는 로드 후 한 번 더 리로드하게 함
+        _signal_seen = _signal_stamp()
+        data_processor = create_data_processor()
+        if config.RELOAD_INTERVAL > 0 or config.RELOAD_TOKEN:
+            start_watcher()
+
+
+def get_agent():
+    """Agent 싱글톤 패턴 (동시 첫 호출은 한 번의 생성을 기다림)"""
+    if agent is None:
+        if not config.GEMINI_API_KEY:
+            raise ValueError("GEMINI_API_KEY environment variable is not set")
+        _init_flight.do('agent', _init_agent)
+    return agent
+
+
+def _init_agent():
+    global agent
+    if agent is None:
+        from .ai_agent import B2BAnalystAgent
+        agent = B2BAnalystAgent(config.GEMINI_API_KEY, data_processor=get_data_processor())
+
+
+def warm_up():
+    """데이터셋 로드, 전처리, Gemini 클라이언트 생성을 미리 수행"""
+    with _warmup_lock:
+        if warmup_state['status'] == 'done':
+            return
+
+        warmup_state['status'] = 'running'
+        warmup_state['started_at'] = time.time()
+        warmup_state['finished_at'] = None
+        warmup_state['error'] = None
+        try:
+            # 데이터 로드 및 전처리, 시스템 프롬프트용 요약까지 한 번 계산해 둔다
+            get_data_processor().get_sales_summary()
+
+            # API 키가 있을 때만 Gemini 클라이언트까지 준비
+            if config.GEMINI_API_KEY:
+                get_agent()
+            warmup_state['status'] = 'done'
+        except Exception as e:
+            warmup_state['status'] = 'failed'
+            warmup_state['error'] = str(e)
+        finally:
+            warmup_state['finished_at'] = time.time()
+
+
+def start_warmup():
+    """백그라운드 스레드에서 워밍업 시작"""
+    thread = threading.Thread(target=warm_up, name='b2b-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def _swap_data_processor(new_processor):
+    """새 데이터셋으로 교체 (이후 요청부터 사용, 에이전트도 같은 인스턴스를 보게 함)"""
+    global data_processor
+    data_processor = new_processor
+    if agent is not None:
+        agent.data_processor = new_processor
+
+
+def reload_data(reason='manual'):
+    """새 DataProcessor를 만들어 교체 (이미 진행 중이면 False)
+
+    새 데이터셋을 만드는 동안에는 기존 데이터셋으로 요청을 계속 처리하고, 실패하면 기존 데이터셋을 유지한다.
+    """
+    if not _reload_lock.acquire(blocking=False):
+        return False
+    _run_reload(reason)
+    return True
+
+
+def _run_reload(reason):
+    """리로드 수행 (_reload_lock을 잡은 상태로 호출, 끝나면 해제)"""
+    try:
+        reload_state.update(status='running', reason=reason, started_at=time.time(), finished_at=None, error=None)
+        try:
+            new_processor = create_data_processor()
+            # 시스템 프롬프트용 요약을 교체 전에 계산해 둔다
+            new_processor.get_sales_summary()
+            _swap_data_processor(new_processor)
+            reload_state['status'] = 'done'
+            metrics.dataset_reloads.inc(result='success')
+        except Exception as e:
+            reload_state['status'] = 'failed'
+            reload_state['error'] = str(e)
+            metrics.dataset_reloads.inc(result='failure')
+        finally:
+            reload_state['finished_at'] = time.time()
+    finally:
+        _reload_lock.release()
+
+
+def start_reload(reason='manual'):
+    """백그라운드 스레드에서 리로드 시작 (이미 진행 중이면 False)
+
+    락을 여기서 잡아 스레드에 넘기므로, True를 반환하면 리로드가 반드시 실행된다.
+    """
+    if not _reload_lock.acquire(blocking=False):
+        return False
+    try:
+        thread = threading.Thread(target=_run_reload, args=(reason,), name='b2b-reload', daemon=True)
+        thread.start()
+    except BaseException:
+        _reload_lock.release()
+        raise
+    return True
+
+
+def _signal_stamp():
+    """리로드 신호 파일의 수정 시각 (ns, 파일이 없으면 None)"""
+    try:
+        return os.stat(config.RELOAD_SIGNAL_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+
+def signal_reload():
+    """같은 서버의 모든 워커에 리로드 신호 (신호 파일 수정 시각 갱신, 실패하면 False)
+
+    호출한 워커는 직접 리로드하므로 이 신호는 이미 따른 것으로 기록한다.
+    """
+    global _signal_seen
+    try:
+        with open(config.RELOAD_SIGNAL_PATH, 'a'):
+            pass
+        now = time.time_ns()
+        os.utime(config.RELOAD_SIGNAL_PATH, ns=(now, now))
+    except OSError:
+        return False
+    _signal_seen = _signal_stamp()
+    return True
+
+
+def _check_signal():
+    """다른 워커가 보낸 리로드 신호가 있으면 리로드 (이미 리로드 중이면 다음 확인 때 다시 시도)"""
+    global _signal_seen
+    stamp = _signal_stamp()
+    if stamp is not None and stamp != _signal_seen and reload_data('signal'):
+        _signal_seen = stamp
+
+
+def _check_sources(pending):
+    """데이터 파일 변경 확인 - 같은 새 버전이 두 번 연속 보이면(파일 쓰기 완료) 리로드, 다음 확인에 넘길 버전 반환"""
+    current = data_processor
+    try:
+        version = current.source_version()
+    except OSError:
+        # 파일을 교체하는 중
+        return pending
+
+    if version is None or version == current.version:
+        return None
+    if version == pending:
+        reload_data('file_change')
+        return None
+    return version
+
+
+def _watch_sources():
+    """리로드 신호(리로드 API가 켜져 있을 때 SIGNAL_INTERVAL초마다)와 데이터 파일 변경(B2B_RELOAD_INTERVAL초마다) 감시"""
+    intervals = [config.RELOAD_INTERVAL, SIGNAL_INTERVAL if config.RELOAD_TOKEN else 0]
+    step = min(interval for interval in intervals if interval > 0)
+    pending = None
+    next_source_check = time.monotonic() + config.RELOAD_INTERVAL
+    while True:
+        time.sleep(step)
+        if data_processor is None:
+            continue
+        if config.RELOAD_TOKEN:
+            _check_signal()
+        if config.RELOAD_INTERVAL > 0 and time.monotonic() >= next_source_check:
+            next_source_check = time.monotonic() + config.RELOAD_INTERVAL
+            pending = _check_sources(pending)
+
+
+def start_watcher():
+    """리로드 신호 / 데이터 파일 감시 스레드 시작 (프로세스당 하나)"""
+    global _watcher
+    if _watcher is None:
+        _watcher = threading.Thread(target=_watch_sources, name='b2b-watcher', daemon=True)
+        _watcher.start()
+    return _watcher
+
+
+def readiness():
+    """준비 상태 (워밍업 완료 여부)"""
+    status = warmup_state['status']
+
+    elapsed = None
+    if warmup_state['started_at']:
+        elapsed = round((warmup_state['finished_at'] or time.time()) - warmup_state['started_at'], 3)
+
+    return {
+        'ready': status in ('done', 'disabled'),
+        'warmup': status,
+        'warmup_seconds': elapsed,
+        'data_loaded': data_processor is not None,
+        'dataset_version': getattr(data_processor, 'version', None),
+        'agent_loaded': agent is not None,
+        'llm_circuit': agent.llm.breaker.state if agent is not None else None,
+        'reload': dict(reload_state),
+        'error': warmup_state['error']
+    }
+
+
+def _dataset_stat(field):
+    """로드된 데이터셋의 테이블별 통계 값 (메트릭 수집용, 로드 전이면 빈 값)"""
+    if data_processor is None:
+        return {}
+    return {
+        (table,): stats[field]
+        for table, stats in data_processor.dataset_stats().items()
+        if field in stats
+    }
+
+
+metrics.REGISTRY.register(metrics.Gauge(
+    'b2b_dataset_rows', '데이터셋 행 수', ('table',), callback=lambda: _dataset_stat('rows')
+))
+metrics.REGISTRY.register(metrics.Gauge(
+    'b2b_dataset_memory_bytes', '데이터셋 메모리 사용량', ('table',), callback=lambda: _dataset_stat('memory_bytes')
+))
+metrics.REGISTRY.register(metrics.Gauge(
+    'b2b_dataset_disk_bytes', '데이터셋 저장소 파일 크기 (sqlite 백엔드)', ('table',),
+    callback=lambda: _dataset_stat('disk_bytes')
+))
+metrics.REGISTRY.register(metrics.Gauge(
+    'b2b_active_sessions', '최근 B2B_SESSION_TTL 안에 요청이 있었던 대화 세션 수', (),
+    callback=lambda: {(): agent.active_session_count() if agent is not None else 0}
+))
+metrics.REGISTRY.register(metrics.Gauge(
+    'b2b_ready', '워밍업 완료 여부 (1/0)', (),
+    callback=lambda: {(): int(readiness()['ready'])}
+))
@@ -0,0 +1,57 @@
+"""
+중복 호출 합치기 (single-flight)
+
+같은 key로 동시에 들어온 호출 중 첫 호출만 실제로 실행하고, 나머지는 그 실행이 끝나기를 기다려
+같은 결과(또는 같은 예외)를 받는다. 실행이 끝나면 key는 바로 비워지므로 결과를 캐시하지는 않는다.
+공유된 결과는 여러 요청이 함께 보므로 호출한 쪽에서 수정하면 안 된다.
+"""
+import threading
+
+from . import metrics
+
+calls = metrics.REGISTRY.register(metrics.Counter(
+    'b2b_singleflight_calls_total', 'single-flight 호출 수 (result=executed|shared)', ('group', 'result')
+))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """key별 진행 중인 호출을 하나로 합치는 그룹"""
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 func를 실행"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            calls.inc(group=self.name, result='shared')
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        calls.inc(group=self.name, result='executed')
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
@@ -0,0 +1,443 @@
+"""
+SQLite 기반 DataProcessor 백엔드 (B2B_BACKEND=sqlite)
+
+전처리된 판매/기업 데이터를 로컬 SQLite 파일에 저장하고 거래처, 제품명, 매출일 인덱스로 조회한다.
+워커는 판매 데이터 전체를 메모리에 유지하지 않고, 고객/월 단위로 집계된 작은 결과만 pandas로 후처리한다.
+후처리 코드는 pandas 백엔드와 같으므로 결과도 동일하다.
+
+저장소 파일은 데이터셋 버전별로 따로 만들어지고(B2B_SQLITE_PATH 이름 뒤에 fingerprint 해시),
+원본 데이터의 fingerprint(경로, 수정 시각, 크기)가 같으면 재사용되므로 같은 서버의 여러 워커가 하나의 파일을 공유하고,
+재시작 시 CSV/XLSX 파싱을 건너뛴다. 리로드 중인 기존 인스턴스는 계속 자기 버전의 파일을 읽는다.
+다른 워커가 아직 이전 버전을 읽고 있을 수 있으므로, 이전 버전 파일은 더 새 버전 파일이 만들어진 뒤
+B2B_SQLITE_STORE_GRACE초가 지나야 저장소를 로드할 때 삭제된다. 메모리 소스의 파일은 프로세스/인스턴스 전용이라
+인스턴스가 해제될 때 바로 삭제된다.
+"""
+import glob
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import closing
+
+import pandas as pd
+
+from . import config, metrics
+from .data_processor import DataProcessor, coalesced
+
+SALES_TABLE = 'sales'
+COMPANY_TABLE = 'companies'
+META_TABLE = '_meta'
+
+# 저장소 스키마 버전 (저장 형식이 바뀌면 올려서 기존 파일을 다시 만들게 함)
+STORE_VERSION = '1'
+
+# 매출일이 없는 행의 정렬 키 (pandas 정렬에서 NaT가 끝으로 가는 것과 맞춤)
+NULL_DATE_KEY = 9223372036854775807
+
+
+def _to_epoch_us(series):
+    """datetime 컬럼을 정수(epoch 마이크로초)로 변환 - 인덱스 범위 조회와 정렬이 빠름 (NaT는 NULL)"""
+    values = series.astype('datetime64[us]')
+    return pd.Series(values.values.view('int64'), index=series.index).astype('Int64').mask(values.isna())
+
+
+def _timestamp_to_epoch_us(ts):
+    """Timestamp를 epoch 마이크로초로 변환 (SQL 파라미터용)"""
+    return pd.Timestamp(ts).value // 1000
+
+
+def _from_epoch_us(value):
+    """epoch 마이크로초를 Timestamp로 변환"""
+    return pd.Timestamp(int(value), unit='us')
+
+
+def _source_fingerprint(sales_loader, company_loader):
+    """원본 데이터 식별값 - 메모리 DataFrame 등 식별할 수 없으면 None (항상 새로 생성)"""
+    sales = sales_loader.fingerprint()
+    company = company_loader.fingerprint()
+    if sales is None or company is None:
+        return None
+    return f"{STORE_VERSION}|{sales}|{company}"
+
+
+def _release_store(db_path):
+    """메모리 소스 인스턴스 해제 시 전용 저장소 파일 삭제"""
+    try:
+        os.remove(db_path)
+    except OSError:
+        pass
+
+
+class SQLiteDataProcessor(DataProcessor):
+    """전처리된 데이터를 SQLite 파일에 저장하고 SQL로 조회하는 DataProcessor"""
+
+    def __init__(self, sales_source=None, company_source=None, store_path=None):
+        self.store_path = store_path or config.SQLITE_STORE_PATH
+        self.db_path = None
+        self._local = threading.local()
+        self._product_names = None
+        self._customer_names = None
+        super().__init__(sales_source, company_source)
+
+    def load_data(self):
+        """저장소가 최신이면 재사용하고, 아니면 원본을 전처리해 새로 만든다"""
+        self._reset_caches()
+        fingerprint = self._source_fingerprint()
+        self.db_path = self._versioned_path(fingerprint)
+        # 이전 버전 파일에 열린 스레드별 연결은 쓰지 않음
+        self._local = threading.local()
+        if fingerprint is None:
+            weakref.finalize(self, _release_store, self.db_path)
+
+        if fingerprint is None or self._stored_fingerprint() != fingerprint:
+            metrics.cache_requests.inc(cache='sqlite_store', result='miss')
+            self._build_store(fingerprint)
+        else:
+            metrics.cache_requests.inc(cache='sqlite_store', result='hit')
+            with closing(self._connect()) as conn:
+                self.company_data = pd.read_sql_query(f'SELECT * FROM "{COMPANY_TABLE}"', conn)
+        self._remove_stale_stores()
+
+        # 판매 데이터는 저장소에서 조회하므로 메모리에 유지하지 않음
+        self.sales_data = None
+
+        # 검색용 제품명/거래처 목록 (최초 등장 순서)
+        self._product_names = self._distinct_in_first_order('제품명')
+        self._customer_names = self._distinct_in_first_order('거래처')
+
+        self._build_customer_tables()
+
+    def _source_fingerprint(self):
+        """원본 데이터 식별값 - 메모리 DataFrame 등 식별할 수 없으면 None (항상 새로 생성)"""
+        return _source_fingerprint(self.sales_loader, self.company_loader)
+
+    def _versioned_path(self, fingerprint):
+        """데이터셋 버전별 저장소 파일 경로 (store_path 이름 뒤에 fingerprint 해시, 메모리 소스는 인스턴스별)"""
+        root, ext = os.path.splitext(self.store_path)
+        if fingerprint is None:
+            tag = f"{self.version}-{os.getpid()}"
+        else:
+            tag = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:12]
+        return f"{root}-{tag}{ext}"
+
+    def _remove_stale_stores(self):
+        """이전 버전 저장소 파일 정리 - 더 새 버전 파일이 만들어진 지 B2B_SQLITE_STORE_GRACE초가 지난 파일만 삭제
+
+        다른 워커가 이전 버전을 읽는 중일 수 있으므로 바로 지우지 않는다. 메모리 소스 파일(프로세스 전용)은 제외한다.
+        """
+        root, ext = os.path.splitext(self.store_path)
+        built_at = {}
+        for path in glob.glob(f"{glob.escape(root)}-*{ext}"):
+            # 메모리 소스 파일은 버전이 mem-으로 시작
+            if path == self.db_path or os.path.basename(path).startswith(f"{os.path.basename(root)}-mem-"):
+                continue
+            try:
+                built_at[path] = os.path.getmtime(path)
+            except OSError:
+                pass
+        try:
+            built_at[self.db_path] = os.path.getmtime(self.db_path)
+        except OSError:
+            return
+
+        now = time.time()
+        for path, mtime in built_at.items():
+            if path == self.db_path:
+                continue
+            # 이 파일이 이전 버전이 된 시점 = 이후에 만들어진 저장소 중 가장 이른 생성 시각
+            superseded_at = min((other for other in built_at.values() if other > mtime), default=None)
+            if superseded_at is not None and now - superseded_at > config.SQLITE_STORE_GRACE:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _stored_fingerprint(self):
+        """저장소 파일에 기록된 원본 식별값"""
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    f'SELECT value FROM "{META_TABLE}" WHERE key = ?', ('fingerprint',)
+                ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    def _build_store(self, fingerprint):
+        """판매 데이터를 청크별로 전처리해 임시 파일에 추가하고, 인덱스를 만든 뒤 원자적으로 교체
+
+        B2B_CSV_CHUNKSIZE를 설정하면 로드 중 메모리 사용량이 파일 크기가 아닌 청크 크기로 제한된다.
+        """
+        tmp_path = f"{self.db_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        self.company_data = self.company_loader.load()
+        self._preprocess_company_data()
+
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            for chunk in self._iter_sales_chunks():
+                chunk['매출일'] = _to_epoch_us(chunk['매출일'])
+                chunk.to_sql(SALES_TABLE, conn, index=False, if_exists='append')
+            self.company_data.to_sql(COMPANY_TABLE, conn, index=False)
+
+            conn.execute(f'CREATE INDEX idx_sales_customer ON "{SALES_TABLE}" ("거래처")')
+            conn.execute(f'CREATE INDEX idx_sales_product ON "{SALES_TABLE}" ("제품명")')
+            conn.execute(f'CREATE INDEX idx_sales_date ON "{SALES_TABLE}" ("매출일")')
+            conn.execute(f'CREATE INDEX idx_company_customer ON "{COMPANY_TABLE}" ("거래처")')
+
+            conn.execute(f'CREATE TABLE "{META_TABLE}" (key TEXT PRIMARY KEY, value TEXT)')
+            conn.execute(f'INSERT INTO "{META_TABLE}" VALUES (?, ?)', ('fingerprint', fingerprint or ''))
+            conn.execute('ANALYZE')
+            conn.commit()
+
+        os.replace(tmp_path, self.db_path)
+
+    def _connect(self):
+        """저장소 파일에 읽기 전용 연결"""
+        return sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False)
+
+    @property
+    def _conn(self):
+        """스레드별 읽기 전용 연결 (sqlite3 연결은 스레드 간 공유하지 않음)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _query(self, sql, params=()):
+        """SQL 결과를 DataFrame으로 반환"""
+        return pd.read_sql_query(sql, self._conn, params=params)
+
+    def _distinct_in_first_order(self, column):
+        """컬럼의 고유값을 pandas 백엔드(매출일 기준 안정 정렬)에서 처음 등장하는 순서대로 반환"""
+        rows = self._conn.execute(
+            f'WITH first AS ('
+            f'  SELECT "{column}" AS name, MIN(COALESCE("매출일", {NULL_DATE_KEY})) AS first_date'
+            f'  FROM "{SALES_TABLE}" WHERE "{column}" IS NOT NULL GROUP BY "{column}") '
+            f'SELECT f.name FROM first f JOIN "{SALES_TABLE}" s '
+            f'  ON s."{column}" = f.name AND COALESCE(s."매출일", {NULL_DATE_KEY}) = f.first_date '
+            f'GROUP BY f.name ORDER BY f.first_date, MIN(s.rowid)'
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _customer_sales_totals(self):
+        """거래처별 누적매출, 첫/최근 구매일(문자열), 구매횟수 (거래처 인덱스 집계)"""
+        totals = self._query(
+            f'SELECT "거래처", SUM("합계") AS "누적매출", MIN("매출일") AS "첫구매일", '
+            f'MAX("매출일") AS "최근구매일", COUNT("매출일") AS "구매횟수" '
+            f'FROM "{SALES_TABLE}" WHERE "거래처" IS NOT NULL GROUP BY "거래처" ORDER BY "거래처"'
+        )
+        for col in ['첫구매일', '최근구매일']:
+            totals[col] = pd.to_datetime(totals[col], unit='us').dt.strftime('%Y-%m-%d')
+        return totals
+
+    def _customer_product_totals(self):
+        """거래처/제품별 수량, 매출 합계"""
+        return self._query(
+            f'SELECT "거래처", "제품명", SUM("수량") AS "수량", SUM("합계") AS "합계" FROM "{SALES_TABLE}" '
+            f'WHERE "거래처" IS NOT NULL AND "제품명" IS NOT NULL '
+            f'GROUP BY "거래처", "제품명" ORDER BY "거래처", "제품명"'
+        )
+
+    @staticmethod
+    def _date_clause(start=None, end=None):
+        """[start, end) 기간 조건 (매출일 인덱스 범위 조회)"""
+        conditions, params = [], []
+        if start is not None:
+            conditions.append('"매출일" >= ?')
+            params.append(_timestamp_to_epoch_us(start))
+        if end is not None:
+            conditions.append('"매출일" < ?')
+            params.append(_timestamp_to_epoch_us(end))
+        return conditions, params
+
+    @staticmethod
+    def _placeholders(values):
+        return ', '.join('?' for _ in values)
+
+    @coalesced
+    def get_product_sales_analysis(self, product_code, start=None, end=None, region=None, industry=None,
+                                   limit=None, offset=0):
+        """특정 제품의 판매 분석 (기간/지역/업종 조건은 SQL WHERE 절로 집계 전에 적용)"""
+        # 제품명 목록에서 코드가 포함된 제품을 찾은 뒤 제품명 인덱스로 조회
+        product_names = self._match(self._product_names, product_code)
+        if not product_names:
+            return None
+
+        conditions, params = self._date_clause(*self._parse_date_range(start, end))
+        conditions.insert(0, f'"제품명" IN ({self._placeholders(product_names)})')
+        params = list(product_names) + params
+
+        customers = self._customers_with(region, industry)
+        if customers is not None:
+            conditions.append(f'"거래처" IN ({self._placeholders(customers)})')
+            params += customers
+
+        where = f'WHERE {" AND ".join(conditions)}'
+
+        total_quantity, total_revenue, avg_margin, transaction_count = self._conn.execute(
+            f'SELECT SUM("수량"), SUM("합계"), AVG("마진율"), COUNT(*) FROM "{SALES_TABLE}" {where}',
+            params
+        ).fetchone()
+        if transaction_count == 0:
+            return None
+
+        # 월별 판매 추이 (pandas groupby처럼 매출일이 없는 행은 제외)
+        monthly_sales = self._query(
+            f'SELECT "연도", "월", SUM("수량") AS "수량", SUM("합계") AS "합계" '
+            f'FROM "{SALES_TABLE}" {where} AND "매출일" IS NOT NULL GROUP BY "연도", "월" ORDER BY "연도", "월"',
+            params
+        )
+
+        # 구매 기업 리스트
+        customer_list = self._query(
+            f'SELECT "거래처", SUM("수량") AS "총구매수량", SUM("합계") AS "총구매금액", '
+            f'COUNT("매출일") AS "구매횟수" FROM "{SALES_TABLE}" {where} AND "거래처" IS NOT NULL '
+            f'GROUP BY "거래처" ORDER BY "거래처"',
+            params
+        )
+
+        return self._product_result(
+            product_code, total_quantity, total_revenue, avg_margin, transaction_count,
+            monthly_sales, customer_list, limit, offset
+        )
+
+    @coalesced
+    def get_product_sales_analysis_batch(self, product_codes, start=None, end=None, region=None, industry=None,
+                                         limit=None, offset=0):
+        """여러 제품의 판매 분석 (일치하는 제품명 전체를 SQL로 한 번에 제품명별 집계한 뒤 코드별로 합침)"""
+        codes = list(dict.fromkeys(product_codes))
+        matches = self._match_many(self._product_names, codes)
+        product_names = list(dict.fromkeys(name for code in codes for name in matches[code]))
+        if not product_names:
+            return dict.fromkeys(codes)
+
+        conditions, params = self._date_clause(*self._parse_date_range(start, end))
+        conditions.insert(0, f'"제품명" IN ({self._placeholders(product_names)})')
+        params = list(product_names) + params
+
+        customers = self._customers_with(region, industry)
+        if customers is not None:
+            conditions.append(f'"거래처" IN ({self._placeholders(customers)})')
+            params += customers
+
+        where = f'WHERE {" AND ".join(conditions)}'
+
+        # 제품명 -> 코드 위치 (_product, 여러 코드에 일치하면 여러 행)
+        owners = pd.DataFrame(
+            [(name, i) for i, code in enumerate(codes) for name in matches[code]], columns=['제품명', '_product']
+        )
+
+        totals = self._query(
+            f'SELECT "제품명", SUM("수량") AS "수량", SUM("합계") AS "합계", SUM("마진율") AS "마진율합계", '
+            f'COUNT(*) AS "거래수" FROM "{SALES_TABLE}" {where} GROUP BY "제품명"',
+            params
+        ).merge(owners, on='제품명').groupby('_product')[['수량', '합계', '마진율합계', '거래수']].sum()
+        totals['마진율'] = totals['마진율합계'] / totals['거래수']
+
+        # 월별 판매 추이 (pandas groupby처럼 매출일이 없는 행은 제외)
+        monthly_sales = self._query(
+            f'SELECT "제품명", "연도", "월", SUM("수량") AS "수량", SUM("합계") AS "합계" '
+            f'FROM "{SALES_TABLE}" {where} AND "매출일" IS NOT NULL GROUP BY "제품명", "연도", "월"',
+            params
+        ).merge(owners, on='제품명')
+        monthly_sales = monthly_sales.groupby(['_product', '연도', '월'])[['수량', '합계']].sum().reset_index()
+
+        # 구매 기업 리스트
+        customer_list = self._query(
+            f'SELECT "제품명", "거래처", SUM("수량") AS "총구매수량", SUM("합계") AS "총구매금액", '
+            f'COUNT("매출일") AS "구매횟수" FROM "{SALES_TABLE}" {where} AND "거래처" IS NOT NULL '
+            f'GROUP BY "제품명", "거래처"',
+            params
+        ).merge(owners, on='제품명')
+        customer_list = customer_list.groupby(['_product', '거래처'])[['총구매수량', '총구매금액', '구매횟수']].sum().reset_index()
+
+        return self._product_batch_results(codes, totals, monthly_sales, customer_list, limit, offset)
+
+    def _latest_date(self, start=None, end=None):
+        """기간 내 가장 최근 매출일 (데이터가 없으면 None)"""
+        conditions, params = self._date_clause(start, end)
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        latest = self._conn.execute(f'SELECT MAX("매출일") FROM "{SALES_TABLE}" {where}', params).fetchone()[0]
+        return None if latest is None else _from_epoch_us(latest)
+
+    def _customer_trend_table(self, months, start=None, end=None):
+        """고객별 총매출, 첫/최근 구매일, 구매횟수, 최근/이전 N개월 매출을 한 번의 집계로 계산"""
+        latest_date = self._latest_date(start, end)
+        if latest_date is None:
+            return None
+
+        cutoff_date = latest_date - pd.DateOffset(months=months)
+        previous_cutoff = cutoff_date - pd.DateOffset(months=months)
+
+        conditions, params = self._date_clause(start, end)
+        conditions.append('"거래처" IS NOT NULL')
+
+        analysis = self._query(
+            f'SELECT "거래처", SUM("합계") AS "총매출", MIN("매출일") AS "첫구매일", '
+            f'MAX("매출일") AS "최근구매일", COUNT("매출일") AS "구매횟수", '
+            f'TOTAL(CASE WHEN "매출일" >= ? THEN "합계" END) AS "최근{months}개월매출", '
+            f'TOTAL(CASE WHEN "매출일" >= ? AND "매출일" < ? THEN "합계" END) AS "이전{months}개월매출" '
+            f'FROM "{SALES_TABLE}" WHERE {" AND ".join(conditions)} GROUP BY "거래처" ORDER BY "거래처"',
+            [
+                _timestamp_to_epoch_us(cutoff_date),
+                _timestamp_to_epoch_us(previous_cutoff),
+                _timestamp_to_epoch_us(cutoff_date)
+            ] + params
+        )
+
+        # 날짜를 문자열로 변환 (JSON 직렬화 오류 방지)
+        for col in ['첫구매일', '최근구매일']:
+            analysis[col] = pd.to_datetime(analysis[col], unit='us').dt.strftime('%Y-%m-%d')
+
+        return analysis
+
+    def _sales_summary(self, start=None, end=None):
+        """[start, end) 기간의 판매 요약 계산"""
+        conditions, params = self._date_clause(start, end)
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+
+        total_revenue, total_transactions, unique_customers = self._conn.execute(
+            f'SELECT TOTAL("합계"), COUNT(*), COUNT(DISTINCT "거래처") FROM "{SALES_TABLE}" {where}',
+            params
+        ).fetchone()
+        if total_transactions == 0:
+            return None
+        avg_transaction = total_revenue / total_transactions
+
+        # 최근 1년 매출 (매출일 인덱스 범위 조회)
+        latest_date = self._latest_date(start, end)
+        one_year_ago = latest_date - pd.DateOffset(years=1)
+        conditions, params = self._date_clause(max(one_year_ago, start) if start else one_year_ago, end)
+        recent_revenue = self._conn.execute(
+            f'SELECT TOTAL("합계") FROM "{SALES_TABLE}" WHERE {" AND ".join(conditions)}',
+            params
+        ).fetchone()[0]
+
+        return {
+            'total_revenue': int(total_revenue),
+            'total_transactions': total_transactions,
+            'unique_customers': unique_customers,
+            'avg_transaction': int(avg_transaction),
+            'recent_year_revenue': int(recent_revenue),
+            'latest_date': latest_date.strftime('%Y-%m-%d')
+        }
+
+    def dataset_stats(self):
+        """테이블별 행 수와 메모리 사용량 - 판매 데이터는 메모리 대신 저장소 파일 크기(disk_bytes)로 보고"""
+        if self._dataset_stats is None:
+            sales_rows = self._conn.execute(f'SELECT COUNT(*) FROM "{SALES_TABLE}"').fetchone()[0]
+            self._dataset_stats = {
+                'sales': {'rows': sales_rows, 'memory_bytes': 0, 'disk_bytes': os.path.getsize(self.db_path)},
+                'companies': {
+                    'rows': len(self.company_data),
+                    'memory_bytes': int(self.company_data.memory_usage(deep=True).sum())
+                }
+            }
+        return self._dataset_stats
@@ -0,0 +1,46 @@
+"""요청 단계별 소요 시간 측정 (채팅 요청의 병목 구간 확인용)"""
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text):
+    """토큰 수 추정 (usage_metadata가 없을 때) - UTF-8 4바이트당 1토큰, 한글은 글자당 약 0.75토큰"""
+    return (len(text.encode('utf-8')) + 3) // 4
+
+
+class Timings:
+    """단계(span)별 소요 시간(ms)과 토큰 수, 데이터 크기 등 부가 정보를 기록"""
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.stages = {}
+        self.values = {}
+
+    @contextmanager
+    def span(self, name):
+        """with 블록의 소요 시간을 name 단계로 기록 (같은 이름은 누적)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stages[name] = round(self.stages.get(name, 0) + elapsed, 3)
+
+    def set(self, **values):
+        """토큰 수, 바이트 크기 등 부가 정보 기록"""
+        self.values.update(values)
+
+    def as_dict(self):
+        return {
+            'total_ms': round((time.perf_counter() - self._started) * 1000, 3),
+            'stages_ms': dict(self.stages),
+            **self.values
+        }
+
+    def log(self, label):
+        """단계별 시간을 한 줄 JSON으로 로그 (INFO)"""
+        logger.info('%s timings %s', label, json.dumps(self.as_dict(), ensure_ascii=False))
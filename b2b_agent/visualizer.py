@@ -1,12 +1,15 @@
-import pandas as pd
 import json
 
 class DataVisualizer:
-    """데이터 시각화 클래스 - 클라이언트 사이드 렌더링용 데이터 반환"""
+    """데이터 시각화 클래스 - 클라이언트 사이드 렌더링용 데이터 반환
+
+    pandas는 콜드 스타트 시간을 줄이기 위해 실제로 차트를 만들 때 import 한다.
+    """
 
     @staticmethod
     def create_line_chart(data, title, x_field, y_field):
         """라인 차트 데이터 생성"""
+        import pandas as pd
         df = pd.DataFrame(data)
 
         chart_data = {
@@ -25,6 +28,7 @@ class DataVisualizer:
     @staticmethod
     def create_bar_chart(data, title, x_field, y_field, limit=10):
         """막대 차트 데이터 생성"""
+        import pandas as pd
         df = pd.DataFrame(data).head(limit)
 
         chart_data = {
@@ -43,6 +47,7 @@ class DataVisualizer:
     @staticmethod
     def create_table(data, title, columns=None):
         """테이블 데이터 생성"""
+        import pandas as pd
         df = pd.DataFrame(data)
 
         if columns:
@@ -62,8 +67,12 @@ class DataVisualizer:
     @staticmethod
     def create_monthly_sales_chart(monthly_data, product_code):
         """월별 판매 추이 차트"""
+        chart_data = [
+            {'판매월': f"{int(row['연도'])}-{int(row['월']):02d}", '판매금액': row['합계']}
+            for row in monthly_data
+        ]
         return DataVisualizer.create_line_chart(
-            monthly_data,
+            chart_data,
             f'{product_code} 월별 판매 추이',
             '판매월',
             '판매금액'
@@ -75,7 +84,7 @@ class DataVisualizer:
         return DataVisualizer.create_bar_chart(
             customer_data,
             f'TOP {limit} 고객',
-            '고객명',
+            '거래처',
             value_field,
             limit
         )
@@ -83,6 +92,7 @@ class DataVisualizer:
     @staticmethod
     def create_trend_comparison_chart(increasing_data, decreasing_data):
         """트렌드 비교 차트"""
+        import pandas as pd
         df_inc = pd.DataFrame(increasing_data).head(10)
         df_dec = pd.DataFrame(decreasing_data).head(10)
 
@@ -91,12 +101,12 @@ class DataVisualizer:
             "title": "구매 트렌드 비교",
             "data": {
                 "increasing": {
-                    "labels": df_inc['고객명'].tolist(),
-                    "values": df_inc['증감률'].tolist()
+                    "labels": df_inc['거래처'].tolist(),
+                    "values": df_inc['증감율'].tolist()
                 },
                 "decreasing": {
-                    "labels": df_dec['고객명'].tolist(),
-                    "values": df_dec['증감률'].tolist()
+                    "labels": df_dec['거래처'].tolist(),
+                    "values": df_dec['증감율'].tolist()
                 }
             }
         }
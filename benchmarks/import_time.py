@@ -0,0 +1,125 @@
+"""
+콜드 스타트 import 시간 벤치마크
+
+`python -X importtime`으로 서버 진입점(app.py, api/index.py)을 새 인터프리터에서
+import 하고, 전체 소요 시간과 가장 무거운 모듈을 보고한다.
+
+사용 예:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 5 --top 15
+    python benchmarks/import_time.py --budget-ms 800 --json import_time.json
+
+--budget-ms를 넘으면 종료 코드 1을 반환하므로 CI에서 회귀 감지에 사용할 수 있다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (이름, import 할 모듈, sys.path에 추가할 디렉토리)
+TARGETS = {
+    'app': ('app', REPO_ROOT),
+    'api': ('index', os.path.join(REPO_ROOT, 'api')),
+}
+
+
+def run_importtime(module, path):
+    """새 인터프리터에서 모듈을 import 하고 -X importtime 출력을 파싱"""
+    code = f"import sys; sys.path.insert(0, {path!r}); import {module}"
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us),
+            'depth': depth
+        })
+    return rows
+
+
+def summarize(rows, top):
+    """전체 import 시간과 누적 시간 기준 상위 모듈"""
+    # 최상위(depth 0) 항목의 누적 시간 합이 전체 import 시간
+    total_us = sum(r['cumulative_us'] for r in rows if r['depth'] == 0)
+    # 진입점이 직접 import 한 모듈(depth 1) 중 무거운 순서
+    heaviest = sorted(
+        (r for r in rows if r['depth'] == 1),
+        key=lambda r: r['cumulative_us'],
+        reverse=True
+    )[:top]
+    return {
+        'total_ms': round(total_us / 1000, 1),
+        'module_count': len(rows),
+        'heaviest': [
+            {'module': r['module'], 'cumulative_ms': round(r['cumulative_us'] / 1000, 1)}
+            for r in heaviest
+        ],
+        'loaded': sorted({r['module'].split('.')[0] for r in rows})
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='서버 진입점 import 시간 측정')
+    parser.add_argument('--target', choices=sorted(TARGETS), action='append',
+                        help='측정 대상 (기본: 전체)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (중앙값 보고)')
+    parser.add_argument('--top', type=int, default=10, help='표시할 상위 모듈 수')
+    parser.add_argument('--budget-ms', type=float, help='허용 import 시간 (초과 시 실패)')
+    parser.add_argument('--json', dest='json_path', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    for name in args.target or sorted(TARGETS):
+        module, path = TARGETS[name]
+        runs = [summarize(run_importtime(module, path), args.top) for _ in range(args.repeat)]
+        median_ms = statistics.median(r['total_ms'] for r in runs)
+        # 상위 모듈 목록은 중앙값에 가장 가까운 실행 기준
+        representative = min(runs, key=lambda r: abs(r['total_ms'] - median_ms))
+
+        heavy_modules = [m for m in ('pandas', 'numpy', 'google') if m in representative['loaded']]
+        results[name] = {
+            'median_ms': median_ms,
+            'runs_ms': [r['total_ms'] for r in runs],
+            'module_count': representative['module_count'],
+            'heavy_modules_loaded': heavy_modules,
+            'heaviest': representative['heaviest']
+        }
+
+        print("=" * 50)
+        print(f"{name} ({module}) import: 중앙값 {median_ms:.1f}ms  {results[name]['runs_ms']}")
+        print(f"로드된 모듈 수: {representative['module_count']}")
+        print(f"무거운 모듈 로드 여부: {', '.join(heavy_modules) or '없음'}")
+        for item in representative['heaviest']:
+            print(f"  {item['cumulative_ms']:>9.1f}ms  {item['module']}")
+
+        if args.budget_ms is not None and median_ms > args.budget_ms:
+            print(f"!! {name}: {median_ms:.1f}ms > 예산 {args.budget_ms:.1f}ms")
+            failed = True
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
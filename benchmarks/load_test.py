@@ -0,0 +1,351 @@
+"""
+HTTP 부하 테스트 (Gemini 호출 없이)
+
+Gemini 모델을 지연 시간/응답 길이를 지정할 수 있는 스텁으로 바꾼 Flask 앱(app.py)을
+gunicorn(gthread)으로 워커/스레드 수를 바꿔 가며 띄우고, /api/chat, /api/analytics/*,
+/api/search/* 요청을 섞어 보낸 뒤 RPS, 지연 시간(p50/p95/p99), 오류율을 보고한다.
+
+사용 예:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --workers 1 2 4 --threads 1 8 --concurrency 32 --duration 30
+    python benchmarks/load_test.py --stub-latency-ms 3000 --stub-response-chars 4000
+    python benchmarks/load_test.py --rows 100k --mix chat=0,product=40,trends=30,search_products=30
+    python benchmarks/load_test.py --json load_test.json
+
+--rows를 주면 processor_bench.py의 합성 원장을 사용하고, 주지 않으면 설정된 데이터 파일
+(B2B_DATA_DIR, B2B_BACKEND 등)을 사용한다. 같은 설정의 서버를 직접 띄우려면:
+    gunicorn --pythonpath benchmarks 'load_test:create_app()'
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import quote
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+# 기본 요청 비율 (가중치)
+DEFAULT_MIX = {
+    'chat': 15,
+    'product': 20,
+    'trends': 15,
+    'marketing': 10,
+    'summary': 10,
+    'search_products': 15,
+    'search_customers': 15,
+}
+
+CHAT_MESSAGES = [
+    '{product} 제품 판매 분석해줘',
+    '{product} 구매 고객 특성과 트렌드를 알려줘',
+    '최근 구매량이 감소한 고객을 그래프로 보여줘',
+    '마케팅 추천 대상 고객 알려줘',
+]
+
+
+class StubResponse:
+    """GenerateContentResponse 대역"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class StubChat:
+    """ChatSession 대역 - 지정한 지연 후 지정한 길이의 응답 반환"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def send_message(self, content, request_options=None):
+        time.sleep(self.model.latency_ms / 1000)
+        return StubResponse(self.model.response_text)
+
+
+class StubGenerativeModel:
+    """google.generativeai.GenerativeModel 대역 (B2BAnalystAgent(model=...)로 주입)"""
+
+    def __init__(self, latency_ms=800, response_chars=2000):
+        self.latency_ms = latency_ms
+        paragraph = '📊 핵심 요약\n| 거래처 | 총구매금액 |\n|---|---|\n| 테스트상사 | 1,234,567원 |\n'
+        self.response_text = (paragraph * (response_chars // len(paragraph) + 1))[:response_chars]
+
+    def start_chat(self, history=None):
+        return StubChat(self)
+
+
+def create_app():
+    """스텁 모델을 주입한 Flask 앱 (gunicorn 'load_test:create_app()')
+
+    B2B_STUB_LATENCY_MS, B2B_STUB_RESPONSE_CHARS로 스텁을, B2B_LOADTEST_ROWS로 합성 데이터 행 수를 정한다.
+    """
+    from b2b_agent import runtime
+    from b2b_agent.ai_agent import B2BAnalystAgent
+    import app as server
+
+    rows = int(os.environ.get('B2B_LOADTEST_ROWS') or 0)
+    if rows:
+        from b2b_agent.data_processor import DataProcessor
+        from processor_bench import make_ledger
+        runtime.data_processor = DataProcessor(*make_ledger(rows))
+
+    model = StubGenerativeModel(
+        latency_ms=float(os.environ.get('B2B_STUB_LATENCY_MS', 800)),
+        response_chars=int(os.environ.get('B2B_STUB_RESPONSE_CHARS', 2000))
+    )
+    runtime.agent = B2BAnalystAgent('stub', data_processor=runtime.get_data_processor(), model=model)
+    return server.app
+
+
+def parse_mix(value):
+    """'chat=10,product=20' 형식의 요청 비율"""
+    mix = dict(DEFAULT_MIX)
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"알 수 없는 요청 종류입니다: {name} ({', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight)
+    return mix
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, workers, threads, args):
+    """gunicorn으로 스텁 앱 실행 (저장소의 gunicorn.conf.py 설정을 그대로 사용)"""
+    env = dict(os.environ)
+    env['B2B_STUB_LATENCY_MS'] = str(args.stub_latency_ms)
+    env['B2B_STUB_RESPONSE_CHARS'] = str(args.stub_response_chars)
+    if args.rows:
+        env['B2B_LOADTEST_ROWS'] = str(args.rows)
+
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn',
+         '--pythonpath', BENCH_DIR,
+         '--bind', f'127.0.0.1:{port}',
+         '--workers', str(workers),
+         '--threads', str(threads),
+         '--worker-class', 'gthread',
+         '--timeout', str(args.server_timeout),
+         '--log-level', 'warning',
+         'load_test:create_app()'],
+        cwd=REPO_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=None if args.verbose else subprocess.DEVNULL
+    )
+
+
+def request(conn, method, path, body=None):
+    """요청을 보내고 (상태 코드, 응답 본문) 반환"""
+    headers = {}
+    if body is not None:
+        body = json.dumps(body)
+        headers['Content-Type'] = 'application/json'
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def wait_ready(port, process, timeout):
+    """/api/health/ready가 200을 반환할 때까지 대기"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버가 시작 중 종료되었습니다 (exit {process.returncode}, --verbose로 로그 확인)")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            status, _ = request(conn, 'GET', '/api/health/ready')
+            conn.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"서버가 {timeout}초 안에 준비되지 않았습니다")
+
+
+def discover_names(port):
+    """요청에 사용할 제품명/거래처 목록 (검색 API의 상위 결과)"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    _, body = request(conn, 'GET', '/api/search/products?keyword=')
+    products = json.loads(body)['products']
+    _, body = request(conn, 'GET', '/api/search/customers?keyword=')
+    customers = json.loads(body)['customers']
+    conn.close()
+    if not products or not customers:
+        raise RuntimeError("데이터에 제품/거래처가 없습니다")
+    return products, customers
+
+
+def make_request(name, rng, products, customers):
+    """요청 종류별 (method, path, body)"""
+    product = rng.choice(products)
+    customer = rng.choice(customers)
+    if name == 'chat':
+        return 'POST', '/api/chat', {'message': rng.choice(CHAT_MESSAGES).format(product=product)}
+    if name == 'product':
+        return 'GET', f'/api/analytics/product/{quote(product)}?limit=20', None
+    if name == 'trends':
+        return 'GET', f'/api/analytics/trends?months={rng.choice([3, 6, 12])}', None
+    if name == 'marketing':
+        return 'GET', '/api/analytics/marketing', None
+    if name == 'summary':
+        return 'GET', '/api/summary', None
+    if name == 'search_products':
+        return 'GET', f'/api/search/products?keyword={quote(product[:4])}', None
+    return 'GET', f'/api/search/customers?keyword={quote(customer[:3])}', None
+
+
+def run_clients(port, args, products, customers, duration):
+    """concurrency 개의 클라이언트 스레드가 duration초 동안 요청을 보내고 (종류, 지연 시간, 성공 여부) 목록 반환"""
+    names = [name for name, weight in args.mix.items() if weight > 0]
+    weights = [args.mix[name] for name in names]
+    results = []
+    deadline = time.perf_counter() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=args.request_timeout)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path, body = make_request(name, rng, products, customers)
+            started = time.perf_counter()
+            try:
+                status, _ = request(conn, method, path, body)
+                ok = status < 400
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                ok = False
+            results.append((name, time.perf_counter() - started, ok))
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(args.seed + i,)) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def summarize(results, elapsed):
+    """요청 결과의 RPS, 지연 시간 분위수(ms), 오류율"""
+    if not results:
+        return {'requests': 0, 'rps': 0, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'error_rate': None}
+
+    latencies = [latency for _, latency, _ in results]
+    if len(latencies) == 1:
+        p50 = p95 = p99 = latencies[0]
+    else:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p95, p99 = statistics.median(latencies), cuts[94], cuts[98]
+    errors = sum(1 for _, _, ok in results if not ok)
+    return {
+        'requests': len(results),
+        'rps': round(len(results) / elapsed, 2),
+        'p50_ms': round(p50 * 1000, 1),
+        'p95_ms': round(p95 * 1000, 1),
+        'p99_ms': round(p99 * 1000, 1),
+        'error_rate': round(errors / len(results), 4)
+    }
+
+
+def bench_config(workers, threads, args):
+    """워커/스레드 설정 하나에 대한 부하 테스트"""
+    port = free_port()
+    process = start_server(port, workers, threads, args)
+    try:
+        wait_ready(port, process, args.startup_timeout)
+        products, customers = discover_names(port)
+
+        # 워커별 데이터 로드/첫 요청 비용을 측정에서 제외
+        run_clients(port, args, products, customers, args.warmup)
+
+        started = time.perf_counter()
+        results = run_clients(port, args, products, customers, args.duration)
+        elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    by_endpoint = {}
+    for name in args.mix:
+        subset = [r for r in results if r[0] == name]
+        if subset:
+            by_endpoint[name] = summarize(subset, elapsed)
+
+    return {
+        'workers': workers,
+        'threads': threads,
+        'concurrency': args.concurrency,
+        'overall': summarize(results, elapsed),
+        'endpoints': by_endpoint
+    }
+
+
+def print_result(result):
+    print("=" * 78)
+    print(f"workers={result['workers']} threads={result['threads']} concurrency={result['concurrency']}")
+    print(f"  {'request':<17} {'count':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    rows = [('(전체)', result['overall'])] + list(result['endpoints'].items())
+    for name, stats in rows:
+        if not stats['requests']:
+            print(f"  {name:<17} {0:>7}")
+            continue
+        print(f"  {name:<17} {stats['requests']:>7} {stats['rps']:>8.1f} {stats['p50_ms']:>9.1f} "
+              f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['error_rate']:>7.1%}")
+
+
+def main():
+    from processor_bench import parse_size
+
+    parser = argparse.ArgumentParser(description='스텁 Gemini 모델로 API 부하 테스트')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2], help='gunicorn 워커 수 (기본: 1 2)')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4], help='워커당 스레드 수 (기본: 1 4)')
+    parser.add_argument('--concurrency', type=int, default=16, help='동시 클라이언트 수')
+    parser.add_argument('--duration', type=float, default=20, help='측정 시간 (초)')
+    parser.add_argument('--warmup', type=float, default=3, help='측정 전 부하 시간 (초)')
+    parser.add_argument('--mix', type=parse_mix, default=dict(DEFAULT_MIX),
+                        help=f"요청 비율 (예: chat=10,product=20, 기본: {DEFAULT_MIX})")
+    parser.add_argument('--stub-latency-ms', type=float, default=800, help='스텁 모델 응답 지연 (ms)')
+    parser.add_argument('--stub-response-chars', type=int, default=2000, help='스텁 모델 응답 길이 (문자)')
+    parser.add_argument('--rows', type=parse_size, help='합성 원장 행 수 (예: 100k, 기본: 설정된 데이터 파일)')
+    parser.add_argument('--request-timeout', type=float, default=60, help='요청 타임아웃 (초)')
+    parser.add_argument('--server-timeout', type=int, default=120, help='gunicorn 워커 타임아웃 (초)')
+    parser.add_argument('--startup-timeout', type=float, default=300, help='서버 준비 대기 시간 (초)')
+    parser.add_argument('--seed', type=int, default=0, help='요청 선택 난수 시드')
+    parser.add_argument('--verbose', action='store_true', help='gunicorn 로그 출력')
+    parser.add_argument('--json', dest='json_path', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    results = []
+    for workers in args.workers:
+        for threads in args.threads:
+            result = bench_config(workers, threads, args)
+            results.append(result)
+            print_result(result)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    failed = any(r['overall']['error_rate'] for r in results)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""
+DataProcessor 메서드 벤치마크
+
+실제 판매 원장(SALES DATA.csv)과 같은 컬럼/형식(쉼표 숫자, 퍼센트 마진율)의 합성 데이터를
+행 수별로 만들어 DataFrame 로더로 DataProcessor에 넣고, 메서드별 지연 시간(p50/p95/p99)과
+최대 메모리를 측정한다.
+
+측정 대상:
+- load_data: DataProcessor 생성 (전처리, 날짜/이름 인덱스 구축 포함)
+- product: get_product_sales_analysis (제품 코드를 바꿔 가며 호출)
+- batch: get_product_sales_analysis_batch (제품 코드 BATCH_SIZE개씩, product의 BATCH_SIZE회 호출과 비교)
+- trend: get_customer_trend_analysis(6)
+- marketing: get_marketing_recommendations
+- summary: get_sales_summary
+- search: search_products + search_customers
+- recommend: get_related_products + get_product_suggestions (로드 시 만든 동시 구매 인덱스 조회)
+
+사용 예:
+    python benchmarks/processor_bench.py
+    python benchmarks/processor_bench.py --sizes 10k 100k 1m --repeat 30
+    python benchmarks/processor_bench.py --sizes 10m --methods load_data product --skip-memory
+    python benchmarks/processor_bench.py --backend sqlite --json processor_bench.json
+
+최대 메모리는 tracemalloc으로 측정한 Python/NumPy 할당량이다 (SQLite 내부 메모리는 포함되지 않음).
+지연 시간은 tracemalloc을 끈 상태에서 따로 측정한다. 10m 데이터는 생성에만 수 GB 메모리가 필요하다.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from b2b_agent.data_processor import DataProcessor  # noqa: E402
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+METHODS = ['load_data', 'product', 'batch', 'trend', 'marketing', 'summary', 'search', 'recommend']
+# batch 측정에서 한 번에 조회할 제품 코드 수
+BATCH_SIZE = 10
+
+REGIONS = ['경기도', '서울특별시', '인천광역시', '충청남도', '경상남도', '부산광역시', '대구광역시']
+INDUSTRIES = ['제조업', '도매 및 소매업', '건설업', '서비스업']
+PRODUCT_SUFFIXES = ['', 'GF', 'HK', ' BLACK', ' WHITE']
+
+
+def parse_size(value):
+    """'10k', '1m' 등 k/m 접미사가 붙은 수 또는 정수 행 수"""
+    value = value.lower().replace('_', '')
+    if value in SIZES:
+        return SIZES[value]
+    for suffix, unit in (('k', 1_000), ('m', 1_000_000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * unit)
+    return int(value)
+
+
+def _with_commas(values):
+    """정수 배열을 원장 형식의 쉼표 숫자 문자열로 변환"""
+    return [f'{v:,}' for v in values.tolist()]
+
+
+def make_ledger(rows, customers=None, products=None, seed=0):
+    """판매 원장과 같은 컬럼의 합성 판매/기업 데이터 생성
+
+    거래처/제품 수를 주지 않으면 행 수에 비례해 정한다. 제품과 거래처 빈도는 실제 원장처럼
+    소수 항목에 거래가 몰리도록 1/순위 분포를 따르고, 일부 거래처는 기업 데이터에 없다.
+    """
+    rng = np.random.default_rng(seed)
+    customers = customers or int(np.clip(rows // 200, 50, 50_000))
+    products = products or int(np.clip(rows // 2_000, 20, 5_000))
+
+    customer_names = np.array([f'거래처{i:05d}' for i in range(customers)], dtype=object)
+    product_names = np.array([
+        f'{9000 + i // 40}-{i % 40:02d}{PRODUCT_SUFFIXES[i % len(PRODUCT_SUFFIXES)]}' for i in range(products)
+    ], dtype=object)
+
+    def ranked_choice(names):
+        weights = 1.0 / np.arange(1, len(names) + 1)
+        return names[rng.choice(len(names), size=rows, p=weights / weights.sum())]
+
+    quantity = rng.integers(1, 500, rows)
+    cost = rng.integers(100, 5_000, rows)
+    price = (cost * rng.uniform(1.05, 1.6, rows)).astype(np.int64)
+    supply = quantity * price
+    vat = supply // 10
+    margin = (price - cost) / price * 100
+
+    days = rng.integers(0, 7 * 365, rows)
+    dates = np.datetime_as_string(np.datetime64('2019-01-01') + days.astype('timedelta64[D]'), unit='D')
+
+    sales = pd.DataFrame({
+        '번호': np.arange(1, rows + 1),
+        '매출일': dates,
+        '거래처': ranked_choice(customer_names),
+        '담당사원': rng.choice(np.array(['홍길동', '김영희', '이철수'], dtype=object), rows),
+        '제품명': ranked_choice(product_names),
+        '규격': 'EA',
+        '제품군': '테이프',
+        '수량': _with_commas(quantity),
+        '매입단가(3%)': _with_commas(cost),
+        '판매단가': _with_commas(price),
+        '공급가액': _with_commas(supply),
+        '부가세': _with_commas(vat),
+        '합계': _with_commas(supply + vat),
+        '마진율': [f'{v:.1f}%' for v in margin.tolist()],
+    })
+
+    # 기업 데이터 (약 5%의 거래처는 미등록)
+    registered = customer_names[rng.random(customers) >= 0.05]
+    count = len(registered)
+    first_year = rng.integers(2015, 2025, count)
+    companies = pd.DataFrame({
+        '거래처': registered,
+        '사업자등록번호': [f'{a:03d}-{b:02d}-{c:05d}' for a, b, c in zip(
+            rng.integers(100, 999, count).tolist(), rng.integers(1, 99, count).tolist(),
+            rng.integers(0, 99_999, count).tolist())],
+        '총 매출': rng.integers(10_000_000, 5_000_000_000, count),
+        '해당 제품군 매출 합계': rng.integers(1_000_000, 1_000_000_000, count),
+        '고객등급': rng.choice(np.array(['챔피언', '충성고객', '잠재고객', '신규고객'], dtype=object), count),
+        '연평균성장률': rng.normal(5, 20, count),
+        '최초거래연도': first_year,
+        '최신거래연도': np.minimum(first_year + rng.integers(0, 8, count), 2025),
+        '업종': rng.choice(np.array(INDUSTRIES, dtype=object), count),
+        '세부 업종': '기타',
+        '직원수': rng.integers(0, 300, count),
+        '시도': rng.choice(np.array(REGIONS, dtype=object), count),
+        '시군구': '',
+        '주소': '',
+        '상태': '계속사업자',
+        'SNS유무': rng.integers(0, 2, count),
+    })
+
+    return sales, companies
+
+
+def percentiles(samples):
+    """지연 시간 목록(초)의 p50/p95/p99 (밀리초)"""
+    if len(samples) == 1:
+        p50 = p95 = p99 = samples[0]
+    else:
+        cuts = statistics.quantiles(samples, n=100, method='inclusive')
+        p50, p95, p99 = statistics.median(samples), cuts[94], cuts[98]
+    return {
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+    }
+
+
+def peak_memory(func):
+    """func 실행 중 tracemalloc 기준 최대 추가 할당량 (MB)"""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round((peak - baseline) / 1024 / 1024, 2)
+
+
+def make_processor_factory(backend, sales, companies, store_dir):
+    """DataFrame 로더로 DataProcessor를 만드는 함수"""
+    if backend == 'sqlite':
+        from b2b_agent.sql_processor import SQLiteDataProcessor
+        store_path = os.path.join(store_dir, 'bench_store.sqlite')
+        # DataFrame 소스는 fingerprint가 없으므로 매번 저장소를 새로 만든다 (load_data = 저장소 구축 시간)
+        return lambda: SQLiteDataProcessor(sales, companies, store_path=store_path)
+    return lambda: DataProcessor(sales, companies)
+
+
+def method_calls(processor, sales):
+    """메서드 이름별 호출 함수 (i번째 호출마다 인자를 바꿔 캐시/같은 입력 반복을 피함)"""
+    # 거래가 많은 제품부터 골고루 조회
+    product_codes = sales['제품명'].value_counts().index[:50].tolist()
+    product_keywords = sorted({name[:4] for name in product_codes})
+    customer_keywords = ['거래처000', '거래처01', '거래처1', '00']
+    customer_names = sales['거래처'].value_counts().index[:50].tolist()
+
+    def search(i):
+        processor.search_products(product_keywords[i % len(product_keywords)])
+        processor.search_customers(customer_keywords[i % len(customer_keywords)])
+
+    def recommend(i):
+        processor.get_related_products(product_codes[i % len(product_codes)])
+        processor.get_product_suggestions(customer_names[i % len(customer_names)])
+
+    return {
+        'product': lambda i: processor.get_product_sales_analysis(product_codes[i % len(product_codes)], limit=20),
+        'batch': lambda i: processor.get_product_sales_analysis_batch(
+            [product_codes[(i + k) % len(product_codes)] for k in range(BATCH_SIZE)], limit=20
+        ),
+        'trend': lambda i: processor.get_customer_trend_analysis(6),
+        'marketing': lambda i: processor.get_marketing_recommendations(),
+        'summary': lambda i: processor.get_sales_summary(),
+        'search': search,
+        'recommend': recommend,
+    }
+
+
+def time_calls(func, repeat, warmup):
+    """warmup 회 실행 후 repeat 회 지연 시간(초) 측정"""
+    for i in range(warmup):
+        func(i)
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def bench_size(rows, args, store_dir):
+    """한 데이터 크기에 대한 메서드별 측정 결과"""
+    started = time.perf_counter()
+    sales, companies = make_ledger(rows, args.customers, args.products, args.seed)
+    generated_s = time.perf_counter() - started
+    print(f"합성 데이터 생성: {rows:,} rows, 거래처 {sales['거래처'].nunique():,}, "
+          f"제품 {sales['제품명'].nunique():,} ({generated_s:.1f}s)")
+
+    factory = make_processor_factory(args.backend, sales, companies, store_dir)
+    results = {}
+
+    # load_data는 비용이 크므로 별도 반복 횟수로 측정하고, 마지막 인스턴스를 이후 측정에 사용
+    processor = None
+    load_samples = []
+    for _ in range(args.load_repeat):
+        started = time.perf_counter()
+        processor = factory()
+        load_samples.append(time.perf_counter() - started)
+
+    if 'load_data' in args.methods:
+        results['load_data'] = {'calls': len(load_samples), **percentiles(load_samples)}
+        if not args.skip_memory:
+            results['load_data']['peak_mb'] = peak_memory(factory)
+
+    calls = method_calls(processor, sales)
+    for name in args.methods:
+        if name == 'load_data':
+            continue
+        samples = time_calls(calls[name], args.repeat, args.warmup)
+        results[name] = {'calls': len(samples), **percentiles(samples)}
+        if not args.skip_memory:
+            results[name]['peak_mb'] = peak_memory(lambda: calls[name](0))
+
+    dataset_mb = None
+    if processor.sales_data is not None:
+        dataset_mb = round(processor.sales_data.memory_usage(deep=True).sum() / 1024 / 1024, 1)
+
+    return {
+        'rows': rows,
+        'backend': args.backend,
+        'generate_seconds': round(generated_s, 2),
+        'dataset_mb': dataset_mb,
+        'methods': results
+    }
+
+
+def print_result(label, result):
+    print("=" * 72)
+    dataset = f", 판매 데이터 {result['dataset_mb']}MB" if result['dataset_mb'] is not None else ''
+    print(f"{label}: {result['rows']:,} rows ({result['backend']}{dataset})")
+    print(f"  {'method':<10} {'calls':>5} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'peak MB':>9}")
+    for name, stats in result['methods'].items():
+        peak = f"{stats['peak_mb']:>9.2f}" if 'peak_mb' in stats else f"{'-':>9}"
+        print(f"  {name:<10} {stats['calls']:>5} {stats['p50_ms']:>10.2f} {stats['p95_ms']:>10.2f} "
+              f"{stats['p99_ms']:>10.2f} {peak}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DataProcessor 메서드 지연 시간/메모리 측정')
+    parser.add_argument('--sizes', nargs='+', default=['10k', '100k', '1m'],
+                        help='데이터 행 수 (10k, 100k, 1m, 10m 또는 정수, 기본: 10k 100k 1m)')
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=METHODS, help='측정할 메서드 (기본: 전체)')
+    parser.add_argument('--backend', choices=['pandas', 'sqlite'], default='pandas', help='DataProcessor 백엔드')
+    parser.add_argument('--repeat', type=int, default=20, help='메서드별 측정 횟수')
+    parser.add_argument('--load-repeat', type=int, default=3, help='load_data 측정 횟수')
+    parser.add_argument('--warmup', type=int, default=1, help='측정 전 실행 횟수')
+    parser.add_argument('--customers', type=int, help='거래처 수 (기본: 행 수에 비례)')
+    parser.add_argument('--products', type=int, help='제품 수 (기본: 행 수에 비례)')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    parser.add_argument('--skip-memory', action='store_true', help='tracemalloc 메모리 측정 생략 (대용량에서 빠름)')
+    parser.add_argument('--json', dest='json_path', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='b2b-bench-') as store_dir:
+        for size in args.sizes:
+            result = bench_size(parse_size(size), args, store_dir)
+            results[size] = result
+            print_result(size, result)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,12 @@
+# gunicorn 설정 (gunicorn app:app 실행 시 자동으로 로드됨)
+import os
+
+
+def post_worker_init(worker):
+    """워커가 앱을 로드한 직후, 요청을 받기 전에 데이터 워밍업 (B2B_WARMUP=sync)"""
+    from b2b_agent import config, runtime
+
+    if config.WARMUP_MODE == 'sync':
+        worker.log.info("B2B 데이터 워밍업 시작 (pid=%s)", os.getpid())
+        runtime.warm_up()
+        worker.log.info("B2B 데이터 워밍업 상태: %s", runtime.warmup_state['status'])